@@ -2,37 +2,232 @@
 AI关键词提取模块 - 使用Moonshot AI进行关键词提取
 """
 import os
+import logging
 import time
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import random
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 from models import ModelInfo, KeywordResult
-from base_extractor import BaseKeywordExtractor
+from base_extractor import BaseKeywordExtractor, DEFAULT_CACHE_DIR, PROMPT_DIMENSIONS
+from rate_limiter import AsyncTokenBucket
+from log_utils import setup_logging
 
 # 加载环境变量
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+class _RetryLater(Exception):
+    """可重试的错误：调用方应在delay秒后重新提交该模型"""
+    
+    def __init__(self, delay: float):
+        super().__init__(f"retry after {delay:.1f}s")
+        self.delay = delay
+
 
 class KeywordExtractor(BaseKeywordExtractor):
     """关键词提取器"""
     
-    def __init__(self):
-        """初始化AI客户端"""
-        super().__init__()  # 调用基类初始化
-        self.client = OpenAI(
+    # 限流/网络错误的最大重试次数与退避基础延迟（秒）
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 3
+    
+    # 输出无法解析时附带反馈重新请求的最大轮数
+    MAX_FEEDBACK_ROUNDS = 2
+    
+    INVALID_JSON_FEEDBACK = (
+        '上一次的输出不是符合要求的JSON。请只输出一个JSON对象，格式为'
+        '{"keywords": [{"keyword": "...", "dimension": "...", "reason": "..."}]}，'
+        f'包含5-8个关键词，dimension必须是规定的{len(PROMPT_DIMENSIONS)}个维度之一'
+        f'（{"、".join(PROMPT_DIMENSIONS)}），不要输出任何其他内容。'
+    )
+    
+    TRUNCATED_FEEDBACK = (
+        '上一次的输出因长度限制被截断。请重新输出完整的JSON对象，'
+        'reason字段尽量简短，不要输出任何其他内容。'
+    )
+    
+    def __init__(self, max_concurrency: int = 8, llm_cache_enabled: bool = True,
+                 cache_dir: str = DEFAULT_CACHE_DIR, cache_ttl: Optional[float] = None,
+                 models_per_call: int = 4):
+        """
+        初始化AI客户端
+        
+        Args:
+            max_concurrency: 批量提取时同时在途的最大请求数
+            llm_cache_enabled: 是否启用LLM响应缓存
+            cache_dir: 缓存目录
+            cache_ttl: 缓存有效期（秒），None表示永不过期
+            models_per_call: 批量提取时每次请求合并的模型数（1表示逐个请求）
+        """
+        super().__init__(llm_cache_enabled=llm_cache_enabled, cache_dir=cache_dir,
+                         cache_ttl=cache_ttl)  # 调用基类初始化（含缓存配置）
+        self._create_clients()
+        self.model = "kimi-k2-0905-preview"
+        self.max_concurrency = max_concurrency
+        self.models_per_call = max(1, models_per_call)
+        
+        # 客户端限流（令牌桶），配额通过环境变量配置；TPM为0表示不限制
+        rpm = float(os.getenv("MOONSHOT_RPM", "200"))
+        tpm = float(os.getenv("MOONSHOT_TPM", "0"))
+        self._rpm_limiter = AsyncTokenBucket(rpm, period=60)
+        self._tpm_limiter = AsyncTokenBucket(tpm, period=60) if tpm > 0 else None
+        
+        # 移除全局关键词去重，改为在报告生成时去重
+    
+    def _create_clients(self):
+        """创建HTTP连接池和API客户端（连接在首次请求时才建立）"""
+        # 共享连接池：批量请求复用keep-alive连接，避免每次调用重新TLS握手
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        self.aclient = AsyncOpenAI(
             api_key=os.getenv("MOONSHOT_API_KEY"), 
             base_url=os.getenv("MOONSHOT_BASE_URL", "https://api.moonshot.cn/v1"),
+            http_client=self.http_client,
         )
-        self.model = "kimi-k2-0905-preview"
+    
+    async def aclose(self):
+        """关闭底层HTTP连接池，并换上新的客户端，之后的调用仍可正常使用"""
+        await self.aclient.close()
+        self._create_clients()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def _acquire_rate_limit(self, prompt_chars: int, max_tokens: int):
+        """
+        按RPM/TPM配额等待放行
         
-        # 移除全局关键词去重，改为在报告生成时去重
+        Args:
+            prompt_chars: 本次请求的prompt字符数（粗略估算输入token）
+            max_tokens: 本次请求的最大输出token
+        """
+        await self._rpm_limiter.acquire()
+        if self._tpm_limiter:
+            await self._tpm_limiter.acquire(prompt_chars + max_tokens)
     
-    # build_prompt 方法已移至 BaseKeywordExtractor
+    @staticmethod
+    def _retry_after_seconds(error: Exception) -> Optional[float]:
+        """
+        从限流异常的响应头中读取Retry-After
+        
+        Args:
+            error: API异常
+            
+        Returns:
+            建议等待的秒数，无法解析时返回None
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        计算限流/网络错误的重试等待时间（与单模型请求的退避策略一致）
+        
+        Args:
+            error: API异常
+            attempt: 当前是第几次重试
+            
+        Returns:
+            等待秒数；不可重试或重试次数已用完时返回None
+        """
+        if attempt >= self.MAX_RETRIES:
+            return None
+        error_message = str(error).lower()
+        if "429" in error_message or "rate_limit" in error_message:
+            retry_delay = self._retry_after_seconds(error)
+            if retry_delay is None:
+                retry_delay = (30 + attempt * 10) * (1 + random.random())
+            return retry_delay
+        if "timeout" in error_message or "connection" in error_message:
+            return self.RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random())
+        return None
+    
+    # build_prompt、_cache_key、_load_cached_keywords、_save_cached_keywords 方法已移至 BaseKeywordExtractor
+    
+    async def _acreate_completion(self, messages: List[Dict[str, str]], max_tokens: int):
+        """
+        以流式方式请求补全，顶层JSON对象闭合后立即关闭流，不再等待尾部内容
+        
+        Args:
+            messages: 对话消息列表
+            max_tokens: 最大生成token数
+            
+        Returns:
+            (响应内容, finish_reason)
+        """
+        stream = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.3,  # 降低温度保持一致性
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        parts = []
+        finish_reason = None
+        depth = 0
+        in_string = False
+        escaped = False
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                
+                # 增量维护括号深度（忽略字符串内的括号），深度回到0即JSON完整
+                for c in delta:
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif c == '\\':
+                            escaped = True
+                        elif c == '"':
+                            in_string = False
+                    elif c == '"':
+                        in_string = True
+                    elif c == '{':
+                        depth += 1
+                    elif c == '}':
+                        depth -= 1
+                        if depth == 0:
+                            finish_reason = finish_reason or "stop"
+                            return "".join(parts), finish_reason
+        finally:
+            await stream.close()
+        
+        return "".join(parts), finish_reason
     
     def extract_keywords(self, model_info: ModelInfo) -> Optional[KeywordResult]:
         """
-        提取单个模型的关键词（带重试机制和性能监控）
+        提取单个模型的关键词（同步入口）
         
         Args:
             model_info: 模型信息
@@ -40,104 +235,241 @@ class KeywordExtractor(BaseKeywordExtractor):
         Returns:
             关键词提取结果
         """
-        import time
-        start_time = time.time()
-        
-        max_retries = 3
-        base_delay = 3  # 减少基础延迟
+        return asyncio.run(self._aextract_keywords(model_info))
+    
+    async def _aextract_keywords(self, model_info: ModelInfo) -> Optional[KeywordResult]:
+        """
+        提取单个模型的关键词（带重试机制，重试前在当前协程内等待）
         
-        for attempt in range(max_retries + 1):
+        Args:
+            model_info: 模型信息
+            
+        Returns:
+            关键词提取结果
+        """
+        attempt = 0
+        while True:
             try:
-                if attempt > 0:
-                    # 重试时的延迟（指数退避）
-                    retry_delay = base_delay * (2 ** (attempt - 1))
-                    print(f"🔄 第{attempt}次重试，等待 {retry_delay} 秒...")
-                    import time
-                    time.sleep(retry_delay)
-                
-                prompt = self.build_prompt(model_info)
-                
-                if attempt == 0:
-                    print(f"正在为模型 {model_info.project_name} 提取关键词...")
-                else:
-                    print(f"重试中：正在为模型 {model_info.project_name} 提取关键词...")
-                
-                completion = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "你是一位专业的AI项目运营专家和SEO大师，专门负责从AI模型项目中提取高价值的关键词。"},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,  # 降低温度保持一致性
-                    max_tokens=500  # 进一步减少token数量，提高响应速度
+                return await self._aextract_keywords_attempt(model_info, attempt)
+            except _RetryLater as e:
+                await asyncio.sleep(e.delay)
+                attempt += 1
+    
+    async def _aextract_keywords_attempt(self, model_info: ModelInfo, attempt: int = 0) -> Optional[KeywordResult]:
+        """
+        单次尝试提取单个模型的关键词（带性能监控）
+        遇到可重试的错误时抛出_RetryLater，由调用方决定在何处等待
+        
+        Args:
+            model_info: 模型信息
+            attempt: 当前是第几次重试（0表示首次请求）
+            
+        Returns:
+            关键词提取结果
+            
+        Raises:
+            _RetryLater: 限流或网络错误，且重试次数尚未用完
+        """
+        start_time = time.time()
+        
+        # 命中缓存时直接返回，跳过网络请求
+        cache_key = self._cache_key(model_info) if self.llm_cache_enabled else None
+        if cache_key:
+            cached_keywords = self._load_cached_keywords(cache_key)
+            if cached_keywords:
+                logger.info("💾 命中缓存：%s (%s 个关键词)", model_info.project_name, len(cached_keywords))
+                return KeywordResult(
+                    model_url=model_info.url,
+                    keywords=cached_keywords
                 )
+        
+        prompt = self.build_prompt(model_info)
+        max_retries = self.MAX_RETRIES
+        max_tokens = 500  # 进一步减少token数量，提高响应速度
+        
+        try:
+            if attempt == 0:
+                logger.info("正在为模型 %s 提取关键词...", model_info.project_name)
+            else:
+                logger.info("重试中：正在为模型 %s 提取关键词...", model_info.project_name)
+            
+            messages = [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+            request_max_tokens = max_tokens
+            
+            for feedback_round in range(self.MAX_FEEDBACK_ROUNDS + 1):
+                # 客户端限流，避免并发请求触发429
+                await self._acquire_rate_limit(sum(len(m["content"]) for m in messages), request_max_tokens)
                 
-                response_content = completion.choices[0].message.content
+                # JSON模式由服务端保证输出为合法JSON对象，修复逻辑仅作兜底
+                response_content, finish_reason = await self._acreate_completion(messages, request_max_tokens)
                 
                 # 解析JSON响应
                 keywords = self._parse_keywords_response(response_content)
+                if keywords or feedback_round == self.MAX_FEEDBACK_ROUNDS:
+                    break
                 
-                if keywords:
-                    elapsed_time = time.time() - start_time
-                    if attempt > 0:
-                        print(f"✅ 重试成功！提取 {len(keywords)} 个关键词 (耗时: {elapsed_time:.1f}秒)")
-                    else:
-                        print(f"✅ 成功提取 {len(keywords)} 个关键词 (耗时: {elapsed_time:.1f}秒)")
-                    return KeywordResult(
-                        model_url=model_info.url,
-                        keywords=keywords
-                    )
+                # 输出不合格：把上次回复和纠正说明追加到对话中重新请求
+                if finish_reason == "length":
+                    request_max_tokens *= 2
+                    feedback = self.TRUNCATED_FEEDBACK
                 else:
-                    print(f"❌ 未能提取到有效关键词 - 模型: {model_info.project_name}")
-                    print(f"🔍 可能原因: JSON解析失败、关键词数量不足或格式验证失败")
-                    if attempt == max_retries:  # 最后一次尝试才显示详细信息
-                        print(f"📝 AI原始返回内容:")
-                        print("=" * 80)
-                        print(response_content[:1000] + ("..." if len(response_content) > 1000 else ""))
-                        print("=" * 80)
-                    return None
-                    
-            except Exception as e:
-                error_message = str(e)
-                
-                # 检查是否是API限流错误
-                if "429" in error_message or "rate_limit" in error_message.lower():
-                    if attempt < max_retries:
-                        retry_delay = 30 + (attempt * 10)  # 限流时等待更长时间
-                        print(f"⚠️ API限流错误 - 模型: {model_info.project_name}")
-                        print(f"🕐 等待 {retry_delay} 秒后重试...")
-                        import time
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        print(f"❌ API限流错误，重试次数已用完 - 模型: {model_info.project_name}")
-                        print(f"🔍 错误详情: {e}")
-                        return None
+                    feedback = self.INVALID_JSON_FEEDBACK
+                logger.info("🔁 输出不符合要求，附带反馈重新请求 (%s/%s) - 模型: %s", feedback_round + 1, self.MAX_FEEDBACK_ROUNDS, model_info.project_name)
+                messages = messages + [
+                    {"role": "assistant", "content": response_content},
+                    {"role": "user", "content": feedback}
+                ]
+            
+            if keywords:
+                if cache_key:
+                    self._save_cached_keywords(cache_key, keywords)
                 
-                # 检查是否是网络错误
-                elif "timeout" in error_message.lower() or "connection" in error_message.lower():
-                    if attempt < max_retries:
-                        retry_delay = base_delay * 2  # 网络错误时等待较短时间
-                        print(f"⚠️ 网络错误 - 模型: {model_info.project_name}")
-                        print(f"🕐 等待 {retry_delay} 秒后重试...")
-                        import time
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        print(f"❌ 网络错误，重试次数已用完 - 模型: {model_info.project_name}")
-                        print(f"🔍 错误详情: {e}")
-                        return None
+                elapsed_time = time.time() - start_time
+                if attempt > 0:
+                    logger.info("✅ 重试成功！提取 %s 个关键词 (耗时: %.1f秒)", len(keywords), elapsed_time)
+                else:
+                    logger.info("✅ 成功提取 %s 个关键词 (耗时: %.1f秒)", len(keywords), elapsed_time)
+                return KeywordResult(
+                    model_url=model_info.url,
+                    keywords=keywords
+                )
+            else:
+                logger.error("❌ 未能提取到有效关键词 - 模型: %s", model_info.project_name)
+                logger.error("🔍 可能原因: JSON解析失败、关键词数量不足或格式验证失败")
+                if attempt == max_retries:  # 最后一次尝试才显示详细信息
+                    logger.debug("📝 AI原始返回内容:\n%s\n%s\n%s", "=" * 80, response_content[:1000] + ("..." if len(response_content) > 1000 else ""), "=" * 80)
+                return None
                 
-                # 其他错误直接失败
+        except Exception as e:
+            error_message = str(e)
+            
+            # 检查是否是API限流错误
+            if "429" in error_message or "rate_limit" in error_message.lower():
+                if attempt < max_retries:
+                    # 优先遵循服务端返回的Retry-After，缺失时使用较长的默认等待（加随机抖动避免同时重试）
+                    retry_delay = self._retry_after_seconds(e)
+                    if retry_delay is None:
+                        retry_delay = (30 + attempt * 10) * (1 + random.random())
+                    logger.warning("⚠️ API限流错误 - 模型: %s", model_info.project_name)
+                    logger.warning("🕐 等待 %.1f 秒后重试...", retry_delay)
+                    raise _RetryLater(retry_delay) from e
+                else:
+                    logger.error("❌ API限流错误，重试次数已用完 - 模型: %s", model_info.project_name)
+                    logger.error("🔍 错误详情: %s", e)
+                    return None
+            
+            # 检查是否是网络错误
+            elif "timeout" in error_message.lower() or "connection" in error_message.lower():
+                if attempt < max_retries:
+                    # 指数退避 + 随机抖动
+                    retry_delay = self.RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random())
+                    logger.warning("⚠️ 网络错误 - 模型: %s", model_info.project_name)
+                    logger.warning("🕐 等待 %.1f 秒后重试...", retry_delay)
+                    raise _RetryLater(retry_delay) from e
                 else:
-                    print(f"❌ 提取关键词时出错 - 模型: {model_info.project_name}")
-                    print(f"🔍 错误详情: {e}")
-                    print(f"🌐 模型URL: {model_info.url}")
+                    logger.error("❌ 网络错误，重试次数已用完 - 模型: %s", model_info.project_name)
+                    logger.error("🔍 错误详情: %s", e)
                     return None
+            
+            # 其他错误直接失败
+            else:
+                logger.error("❌ 提取关键词时出错 - 模型: %s", model_info.project_name)
+                logger.error("🔍 错误详情: %s", e)
+                logger.error("🌐 模型URL: %s", model_info.url)
+                return None
+    
+    def extract_keywords_multi(self, model_infos: List[ModelInfo]) -> List[Optional[KeywordResult]]:
+        """
+        一次请求提取多个模型的关键词（同步入口）
         
-        # 如果所有重试都失败了
-        print(f"❌ 所有重试尝试均失败 - 模型: {model_info.project_name}")
-        return None
+        Args:
+            model_infos: 模型信息列表
+            
+        Returns:
+            关键词提取结果列表（与输入一一对应，失败为None）
+        """
+        return asyncio.run(self._aextract_keywords_multi(model_infos))
+    
+    async def _aextract_keywords_multi(self, model_infos: List[ModelInfo], fallback: bool = True,
+                                       attempt: int = 0) -> List[Optional[KeywordResult]]:
+        """
+        一次请求提取多个模型的关键词，分摊系统提示和往返开销
+        未命中或解析失败的模型回退到单模型请求（带完整重试机制）
+        
+        Args:
+            model_infos: 模型信息列表
+            fallback: 是否在此处逐个补提缺失的模型（False时缺失项为None，由调用方处理）
+            attempt: 当前是第几次重试（0表示首次请求）
+            
+        Returns:
+            关键词提取结果列表（与输入一一对应，失败为None）
+            
+        Raises:
+            _RetryLater: fallback为False、合并请求遇到限流或网络错误且重试次数尚未用完时
+        """
+        results: List[Optional[KeywordResult]] = [None] * len(model_infos)
+        
+        # 先按每个模型的缓存键查找，只为未命中的模型发起请求
+        pending = []
+        for i, model_info in enumerate(model_infos):
+            cache_key = self._cache_key(model_info) if self.llm_cache_enabled else None
+            cached_keywords = self._load_cached_keywords(cache_key) if cache_key else None
+            if cached_keywords:
+                logger.info("💾 命中缓存：%s (%s 个关键词)", model_info.project_name, len(cached_keywords))
+                results[i] = KeywordResult(model_url=model_info.url, keywords=cached_keywords)
+            else:
+                pending.append((i, model_info, cache_key))
+        
+        if len(pending) > 1:
+            start_time = time.time()
+            pending_models = [model_info for _, model_info, _ in pending]
+            prompt = self.build_multi_prompt(pending_models)
+            max_tokens = 500 * len(pending_models)
+            names = ", ".join(m.project_name for m in pending_models)
+            logger.info("正在为 %s 个模型合并提取关键词: %s", len(pending_models), names)
+            
+            try:
+                # 客户端限流，避免并发请求触发429
+                await self._acquire_rate_limit(len(self.SYSTEM_PROMPT) + len(prompt), max_tokens)
+                
+                response_content, _ = await self._acreate_completion([
+                    {"role": "system", "content": self.SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ], max_tokens)
+                parsed = self._parse_multi_keywords_response(response_content, len(pending_models))
+            except Exception as e:
+                # 由调用方延迟后重新提交时，限流/网络错误交给调用方等待
+                retry_delay = None if fallback else self._retry_delay(e, attempt)
+                if retry_delay is not None:
+                    logger.warning("⚠️ 合并请求遇到限流或网络错误，%.1f 秒后重试: %s", retry_delay, e)
+                    raise _RetryLater(retry_delay) from e
+                logger.warning("⚠️ 合并请求失败，改为逐个提取: %s", e)
+                parsed = {}
+            
+            remaining = []
+            for index, (i, model_info, cache_key) in enumerate(pending):
+                keywords = parsed.get(index)
+                if keywords:
+                    if cache_key:
+                        self._save_cached_keywords(cache_key, keywords)
+                    results[i] = KeywordResult(model_url=model_info.url, keywords=keywords)
+                else:
+                    remaining.append((i, model_info, cache_key))
+            
+            elapsed_time = time.time() - start_time
+            logger.info("✅ 合并请求成功提取 %s/%s 个模型 (耗时: %.1f秒)", len(pending) - len(remaining), len(pending), elapsed_time)
+            pending = remaining
+        
+        # 单个模型或合并请求中缺失的模型走单模型路径
+        if not fallback:
+            return results
+        for i, model_info, _ in pending:
+            results[i] = await self._aextract_keywords(model_info)
+        
+        return results
     
     # _parse_keywords_response 方法已移至 BaseKeywordExtractor
     
@@ -145,7 +477,7 @@ class KeywordExtractor(BaseKeywordExtractor):
     
     def extract_batch_keywords(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
         """
-        批量提取关键词（性能优化版）
+        批量提取关键词（同步入口）
         
         Args:
             model_infos: 模型信息列表
@@ -153,33 +485,118 @@ class KeywordExtractor(BaseKeywordExtractor):
         Returns:
             关键词提取结果列表
         """
-        results = []
+        return asyncio.run(self.extract_batch_keywords_async(model_infos))
+    
+    async def extract_batch_keywords_async(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
+        """
+        批量提取关键词（并发版，固定数量的worker从任务队列取任务）
+        限流/网络错误的模型延迟后重新入队，等待期间不占用worker，其他模型继续处理
+        合并请求失败（如超出上下文长度）时，缺失的模型减半分组重新入队，直至逐个请求
+        
+        Args:
+            model_infos: 模型信息列表
+            
+        Returns:
+            关键词提取结果列表（保持输入顺序）
+        """
+        start_time = time.time()
         total = len(model_infos)
         
-        print(f"开始批量提取 {total} 个模型的关键词...")
-        print(f"⚡ 性能优化：减少延迟，提高处理速度")
+        logger.info("开始批量提取 %s 个模型的关键词...", total)
+        logger.info("⚡ 并发模式：最多 %s 个请求同时进行", self.max_concurrency)
+        if self.models_per_call > 1:
+            logger.info("📦 合并模式：每次请求最多包含 %s 个模型", self.models_per_call)
         
-        for i, model_info in enumerate(model_infos, 1):
-            print(f"\n进度: {i}/{total}")
-            
-            # 跳过无效的模型信息
-            # 说明AI将基于爬取的数据进行分析
-            print(f"📡 模型 {model_info.project_name} - AI将基于爬取的README和标签信息进行分析")
-            
-            result = self.extract_keywords(model_info)
+        # 任务为(模型序号元组, 重试次数)；按models_per_call分组，每组合并为一次请求
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(0, total, self.models_per_call):
+            queue.put_nowait((tuple(range(i, min(i + self.models_per_call, total))), 0))
+        
+        results_by_index: Dict[int, KeywordResult] = {}
+        retry_tasks = set()
+        completed_count = [0]  # 使用列表以便在不同协程间共享
+        
+        def finish(index: int, result: Optional[KeywordResult]):
+            completed_count[0] += 1
+            logger.info("\n进度: %s/%s", completed_count[0], total)
             if result:
-                results.append(result)
+                results_by_index[index] = result
                 # ✨ 实时更新排除队列
                 self.update_exclusion_queue(result.keywords)
-            
-            # 智能延迟：根据处理速度动态调整
-            import time
-            if i < total:  # 最后一个不需要延迟
-                # 如果处理速度快，减少延迟；如果慢，保持适当延迟
-                delay = 1 if i % 5 == 0 else 0.5  # 每5个模型稍微长一点延迟
-                time.sleep(delay)
         
-        print(f"\n批量提取完成，成功处理 {len(results)} 个模型")
+        async def requeue_later(item: Tuple[Tuple[int, ...], int], delay: float):
+            await asyncio.sleep(delay)
+            queue.put_nowait(item)
+        
+        async def worker():
+            while True:
+                indices, attempt = await queue.get()
+                try:
+                    if len(indices) > 1:
+                        chunk = [model_infos[i] for i in indices]
+                        if attempt == 0:
+                            for model_info in chunk:
+                                logger.info("📡 模型 %s - AI将基于爬取的README和标签信息进行分析", model_info.project_name)
+                        try:
+                            chunk_results = await self._aextract_keywords_multi(chunk, fallback=False,
+                                                                               attempt=attempt)
+                        except _RetryLater as e:
+                            # 限流/网络错误：拆成两半，等待delay秒后再重新入队
+                            half = (len(indices) + 1) // 2
+                            for group in (indices[:half], indices[half:]):
+                                task = asyncio.create_task(requeue_later((group, attempt + 1), e.delay))
+                                retry_tasks.add(task)
+                                task.add_done_callback(retry_tasks.discard)
+                            continue
+                        missing = []
+                        for index, result in zip(indices, chunk_results):
+                            if result:
+                                finish(index, result)
+                            else:
+                                missing.append(index)
+                        # 合并请求中缺失的模型拆成两半重新提交，分组逐次减半直到单独请求
+                        half = (len(missing) + 1) // 2
+                        for group in (missing[:half], missing[half:]):
+                            if group:
+                                queue.put_nowait((tuple(group), attempt))
+                    else:
+                        index = indices[0]
+                        model_info = model_infos[index]
+                        if attempt == 0:
+                            logger.info("📡 模型 %s - AI将基于爬取的README和标签信息进行分析", model_info.project_name)
+                        try:
+                            result = await self._aextract_keywords_attempt(model_info, attempt)
+                        except _RetryLater as e:
+                            task = asyncio.create_task(requeue_later(((index,), attempt + 1), e.delay))
+                            retry_tasks.add(task)
+                            task.add_done_callback(retry_tasks.discard)
+                        else:
+                            finish(index, result)
+                except Exception as e:
+                    names = ", ".join(model_infos[i].project_name for i in indices)
+                    logger.error("❌ 模型 %s 提取异常: %s", names, e)
+                    for index in indices:
+                        finish(index, None)
+                finally:
+                    queue.task_done()
+        
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        
+        # 队列清空且没有等待重新入队的任务时才算完成
+        while True:
+            await queue.join()
+            if not retry_tasks:
+                break
+            await asyncio.wait(set(retry_tasks))
+        
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        results = [results_by_index[i] for i in range(total) if i in results_by_index]
+        
+        total_time = time.time() - start_time
+        logger.info("\n批量提取完成，成功处理 %s 个模型 (总耗时: %.1f秒)", len(results), total_time)
         return results
     
     # deduplicate_keywords, _is_similar_keyword_exists, _fix_common_json_errors, _enhance_brand_keywords 方法已移至 BaseKeywordExtractor
@@ -210,4 +627,5 @@ def test_extractor():
 
 
 if __name__ == "__main__":
+    setup_logging()
     test_extractor()
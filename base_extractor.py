@@ -4,59 +4,95 @@
 import os
 import re
 import json
+import time
+import heapq
+import hashlib
+import logging
+from collections import Counter
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 from abc import ABC, abstractmethod
 
-from models import ModelInfo, KeywordResult
+from models import ModelInfo, KeywordResult, json_loads, save_to_json
 
+logger = logging.getLogger(__name__)
 
-class BaseKeywordExtractor(ABC):
-    """基础关键词提取器抽象类"""
-    
-    def __init__(self):
-        """初始化排除队列相关属性"""
-        self.keyword_frequency = {}  # 关键词频率统计
-        self.excluded_keywords = []  # 排除队列
-    
-    def update_exclusion_queue(self, keywords: List[Dict[str, str]]):
-        """更新排除队列 - 每处理一个模型后调用"""
-        # 统计频率
-        for kw_dict in keywords:
-            keyword = kw_dict.get('keyword', '')
-            self.keyword_frequency[keyword] = self.keyword_frequency.get(keyword, 0) + 1
-        
-        # 筛选高频词（出现≥10次）
-        high_freq_keywords = [
-            kw for kw, count in self.keyword_frequency.items() 
-            if count >= 10
-        ]
-        
-        # 按频率排序，取Top 50
-        high_freq_keywords.sort(
-            key=lambda k: self.keyword_frequency[k], 
-            reverse=True
-        )
-        self.excluded_keywords = high_freq_keywords[:50]
-    
-    def build_prompt(self, model_info: ModelInfo) -> str:
-        """
-        根据需求文档构建Prompt
-        
-        Args:
-            model_info: 模型信息
-            
-        Returns:
-            构建好的prompt
-        """
-        prompt = f"""你是AI项目运营专家，你需要在模型页面中提取引流关键词以便投放到博客网站当中。
+# LLM响应缓存目录（按模型内容的SHA-256寻址）
+DEFAULT_CACHE_DIR = os.path.join("cache", "keyword_cache")
 
-项目: {model_info.project_name}
-URL: {model_info.url}
+# 预编译的正则表达式（关键词清理）
+_RE_PAREN = re.compile(r'[()（）]')
+_RE_SPACE = re.compile(r'\s+')
+_RE_ALLOWED = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9\.-]')
+_RE_DASH = re.compile(r'-+')
+_RE_DOT = re.compile(r'\.+')
+_RE_VERSION = re.compile(r'^[A-Za-z0-9]+\.[0-9]+$')
 
-README内容（前800字符）：
-{(model_info.readme[:800] + "...") if model_info.readme and len(model_info.readme) > 800 else (model_info.readme if model_info.readme else "暂无README内容")}
+# 中文引号 → ASCII引号（单次遍历完成全部替换）
+_QUOTE_TRANS = str.maketrans({'\u201c': '"', '\u201d': '"', '\u2018': "'", '\u2019': "'"})
+
+# 预编译的正则表达式（JSON修复）
+_RE_MISSING_OPEN = re.compile(r'(\},\s*\n\s*)("keyword":)')
+_RE_TRAIL_COMMA = re.compile(r',(\s*\}\s*\])')
+_RE_MISSING_COMMA = re.compile(r'(\})\s*\n\s*(\{)')
+
+# 提示词中规定的关键词维度（与SYSTEM_PROMPT中“5个维度”一节的顺序一致，反馈提示等处由此生成）
+PROMPT_DIMENSIONS = ("当前模型品牌名", "功能场景", "部署工具", "技术特性", "参数规格")
 
-标签: {', '.join(model_info.tags) if model_info.tags else "暂无标签"}
+# 需要进行品牌扩展的关键词维度（"当前模型品牌名"为提示词中使用的维度名，"品牌与身份"为旧版名称）
+_BRAND_DIMENSIONS = frozenset({"品牌与身份", "当前模型品牌名"})
+
+# 需要扩展的品牌名称映射（品牌名 → 扩展后的关键词），只读
+_BRAND_MAP = MappingProxyType({
+    # 中国大厂
+    "百度": "百度大模型",
+    "腾讯": "腾讯大模型",
+    "阿里": "阿里大模型",
+    "阿里巴巴": "阿里巴巴大模型",
+    "字节": "字节大模型",
+    "字节跳动": "字节跳动大模型",
+    "华为": "华为大模型",
+    "小米": "小米大模型",
+    "快手": "快手大模型",
+    "网易": "网易大模型",
+    "京东": "京东大模型",
+    "美团": "美团大模型",
+    "滴滴": "滴滴大模型",
+
+    # 国际大厂
+    "OpenAI": "OpenAI大模型",
+    "Google": "Google大模型",
+    "谷歌": "谷歌大模型",
+    "Microsoft": "Microsoft大模型",
+    "微软": "微软大模型",
+    "Meta": "Meta大模型",
+    "Facebook": "Facebook大模型",
+    "Amazon": "Amazon大模型",
+    "亚马逊": "亚马逊大模型",
+    "Apple": "Apple大模型",
+    "苹果": "苹果大模型",
+    "NVIDIA": "NVIDIA大模型",
+    "英伟达": "英伟达大模型",
+
+    # AI创业公司
+    "智谱": "智谱大模型",
+    "月之暗面": "月之暗面大模型",
+    "零一万物": "零一万物大模型",
+    "深度求索": "深度求索大模型",
+    "商汤": "商汤大模型",
+    "旷视": "旷视大模型",
+    "科大讯飞": "科大讯飞大模型",
+    "云知声": "云知声大模型",
+    "出门问问": "出门问问大模型",
+    "小冰": "小冰大模型"
+})
+
+
+class BaseKeywordExtractor(ABC):
+    """基础关键词提取器抽象类"""
+    
+    # 静态的规则与示例放在system消息中，所有请求共享同一前缀（便于服务端前缀缓存）
+    SYSTEM_PROMPT = """你是一位专业的AI项目运营专家和SEO大师，专门负责从AI模型项目中提取高价值的关键词。
 
 ## 核心原则：高亮词是"用户搜索AI模型时会用的词"
 
@@ -139,46 +175,46 @@ README内容（前800字符）：
 ## 输出示例（用户在CSDN搜索时会用的词）
 
 **示例1 - 普通模型**：
-{{
+{
   "keywords": [
-    {{
+    {
       "keyword": "DeepSeek-R1",
       "dimension": "当前模型品牌名", 
       "reason": "从项目名称提取的当前模型名称"
-    }},
-    {{
+    },
+    {
       "keyword": "链式思维",
       "dimension": "技术特性",
       "reason": "当前模型的核心技术特性"
-    }},
-    {{
+    },
+    {
       "keyword": "编程助手",
       "dimension": "功能场景",
       "reason": "当前模型的应用场景"
-    }}
+    }
   ]
-}}
+}
 
 **示例2 - 国产大模型（遵循映射规则）**：
-{{
+{
   "keywords": [
-    {{
+    {
       "keyword": "通义千问",
       "dimension": "当前模型品牌名", 
       "reason": "项目名称中有Qwen，映射为通义千问"
-    }},
-    {{
+    },
+    {
       "keyword": "阿里大模型",
       "dimension": "当前模型品牌名", 
       "reason": "Qwen属于阿里大模型系列"
-    }},
-    {{
+    },
+    {
       "keyword": "7B参数",
       "dimension": "参数规格",
       "reason": "当前模型的参数规格"
-    }}
+    }
   ]
-}}
+}
 
 ⚠️ **错误示例（绝对禁止）**：
 - ❌ 提取"OpenAI-o1"（这是README中作为对比的其他模型）
@@ -186,113 +222,368 @@ README内容（前800字符）：
 - ❌ 提取"GPT-4"（这是README中作为参考的其他模型）
 - ❌ 提取"Qwen"（应该映射为"通义千问"或"阿里大模型"）
 
-要求：5-8个关键词，每个包含keyword、dimension、reason字段。"""
+要求：5-8个关键词，每个包含keyword、dimension、reason字段，只输出一个JSON对象。"""
+    
+    # 用户Prompt模板：静态部分预先写好，每个模型只填充变化的字段
+    USER_PROMPT_TEMPLATE = """你是AI项目运营专家，你需要在模型页面中提取引流关键词以便投放到博客网站当中。
+
+{model_section}
 
-        # 添加排除队列（如果有的话）
-        exclusion_text = ""
-        if self.excluded_keywords:
-            exclusion_text = f"""
+请严格按照系统提示中的规则和输出格式提取关键词。"""
+    
+    MODEL_SECTION_TEMPLATE = """项目: {project_name}
+URL: {url}
+
+README内容（前800字符）：
+{readme}
+
+标签: {tags}"""
+    
+    # 排除队列提示模板（仅在排除队列变化时格式化一次）
+    EXCLUSION_TEMPLATE = """
 
 ## 🚫 强制排除关键词（高频词）
 以下关键词已被大量使用，**严禁再次提取**：
-{', '.join(self.excluded_keywords[:50])}
+{excluded}
 
 你必须提取该模型**独特的、有区分度的**关键词，避开上述所有高频词。
 """
-            prompt += exclusion_text
-
-        return prompt
     
-    def _parse_keywords_response(self, response: str) -> List[Dict[str, str]]:
+    def __init__(self, llm_cache_enabled: bool = True, cache_dir: str = DEFAULT_CACHE_DIR,
+                 cache_ttl: Optional[float] = None):
         """
-        解析AI响应中的关键词JSON
+        初始化排除队列与LLM响应缓存相关属性
         
         Args:
-            response: AI响应内容
+            llm_cache_enabled: 是否启用LLM响应缓存
+            cache_dir: 缓存目录
+            cache_ttl: 缓存有效期（秒），None表示永不过期
+        """
+        # LLM响应缓存配置
+        self.llm_cache_enabled = llm_cache_enabled
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        
+        self.keyword_frequency = Counter()  # 关键词频率统计
+        self.excluded_keywords = []  # 排除队列
+        self._frequent_keywords = {}  # 出现≥10次的候选高频词（dict作有序集合，按首次出现顺序）
+        self._excluded_text_cache = ((), "")  # (排除队列, 格式化后的排除提示)
+    
+    def _cache_key(self, model_info: ModelInfo, platform: Optional[str] = None,
+                   model: Optional[str] = None) -> str:
+        """
+        计算LLM响应缓存键（按模型内容、平台和大模型名称寻址，与排除队列无关）
+        
+        Args:
+            model_info: 模型信息
+            platform: 平台标识（单平台提取器为None）
+            model: 使用的大模型名称，None时取提取器的model属性
             
         Returns:
-            关键词列表
+            SHA-256十六进制摘要
+        """
+        if model is None:
+            model = getattr(self, "model", None)
+        payload = json.dumps(
+            {"system": self.SYSTEM_PROMPT, "project_name": model_info.project_name,
+             "readme": (model_info.readme or "")[:800], "tags": model_info.tags,
+             "platform": platform, "model": model},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _load_cached_keywords(self, cache_key: str) -> Optional[List[Dict[str, str]]]:
+        """
+        读取缓存的关键词，过期或格式不符时返回None
+        
+        Args:
+            cache_key: 缓存键
+            
+        Returns:
+            缓存的关键词列表
+        """
+        cache_path = os.path.join(self.cache_dir, f"{cache_key}.json")
+        if not os.path.exists(cache_path):
+            return None
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if self.cache_ttl is not None and time.time() - entry.get("ts", 0) > self.cache_ttl:
+            return None
+        
+        # 重新校验，旧格式的缓存条目回退为重新请求
+        keywords = entry.get("keywords") or []
+        if not keywords or not all(isinstance(kw, dict) and self._validate_keyword(kw) for kw in keywords):
+            return None
+        
+        return keywords
+    
+    def _save_cached_keywords(self, cache_key: str, keywords: List[Dict[str, str]]):
+        """
+        写入关键词缓存
+        
+        Args:
+            cache_key: 缓存键
+            keywords: 关键词列表
         """
         try:
-            # 第一步：尝试直接解析（AI应该返回标准JSON）
-            cleaned_response = response.strip()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            save_to_json({"keywords": keywords, "ts": time.time()},
+                         os.path.join(self.cache_dir, f"{cache_key}.json"))
+        except OSError as e:
+            logger.warning("⚠️ 写入关键词缓存失败: %s", e)
+    
+    def update_exclusion_queue(self, keywords: List[Dict[str, str]]):
+        """更新排除队列 - 每处理一个模型后调用"""
+        # 统计频率
+        counted = [kw_dict['keyword'] for kw_dict in keywords if kw_dict.get('keyword')]
+        frequency = self.keyword_frequency
+        frequency.update(counted)
+        
+        # 只有本次出现的关键词计数会变化；其中没有高频词时Top 50不会变化
+        reached = [kw for kw in counted if frequency[kw] >= 10]
+        if not reached:
+            return
+        
+        # 有新词达到阈值时（很少发生）按首次出现顺序重建候选集合，保证并列时的顺序与全量扫描一致
+        if any(kw not in self._frequent_keywords for kw in reached):
+            self._frequent_keywords = {kw: None for kw, count in frequency.items() if count >= 10}
+        
+        # 在高频候选词（出现≥10次）中按频率取Top 50，无需扫描全部关键词
+        excluded = tuple(heapq.nlargest(50, self._frequent_keywords, key=frequency.__getitem__))
+        
+        # 排除队列变化时才重新格式化排除提示
+        if excluded != self._excluded_text_cache[0]:
+            self.excluded_keywords = list(excluded)
+            exclusion_text = self.EXCLUSION_TEMPLATE.format_map({"excluded": ', '.join(excluded)}) if excluded else ""
+            self._excluded_text_cache = (excluded, exclusion_text)
+    
+    def _format_model_section(self, model_info: ModelInfo) -> str:
+        """
+        格式化单个模型的信息块（项目、URL、README、标签）
+        
+        Args:
+            model_info: 模型信息
+            
+        Returns:
+            模型信息文本
+        """
+        # README只判断一次长度、只切片一次
+        readme = model_info.readme
+        if not readme:
+            readme = "暂无README内容"
+        elif len(readme) > 800:
+            readme = readme[:800] + "..."
+        
+        tags = model_info.tags
+        return self.MODEL_SECTION_TEMPLATE.format_map({
+            "project_name": model_info.project_name,
+            "url": model_info.url,
+            "readme": readme,
+            "tags": ', '.join(tags) if tags else "暂无标签",
+        })
+    
+    def _build_exclusion_text(self) -> str:
+        """获取排除队列提示（排除队列为空时为空字符串）"""
+        return self._excluded_text_cache[1]
+    
+    def build_prompt(self, model_info: ModelInfo) -> str:
+        """
+        构建用户Prompt（仅包含随模型变化的部分，静态规则见SYSTEM_PROMPT）
+        
+        Args:
+            model_info: 模型信息
             
-            # 清理可能的中文引号问题
-            json_str = cleaned_response.replace('"', '"').replace('"', '"')
-            json_str = json_str.replace(''', "'").replace(''', "'")
+        Returns:
+            构建好的prompt
+        """
+        prompt = self.USER_PROMPT_TEMPLATE.format_map({"model_section": self._format_model_section(model_info)})
+        
+        # 添加排除队列（如果有的话）
+        return prompt + self._build_exclusion_text()
+    
+    def build_multi_prompt(self, model_infos: List[ModelInfo]) -> str:
+        """
+        构建多模型合并请求的用户Prompt
+        
+        Args:
+            model_infos: 模型信息列表
             
-            # 直接尝试解析
-            try:
-                data = json.loads(json_str)
-            except json.JSONDecodeError:
-                # 如果直接解析失败，尝试提取JSON部分
-                if '```json' in json_str:
-                    start = json_str.find('```json') + 7
-                    end = json_str.find('```', start)
-                    if end != -1:
-                        json_str = json_str[start:end].strip()
-                    else:
-                        json_str = json_str[start:].strip()
-                else:
-                    # 查找JSON对象边界
-                    start_pos = json_str.find('{')
-                    if start_pos != -1:
-                        end_pos = json_str.rfind('}')
-                        if end_pos != -1 and end_pos > start_pos:
-                            json_str = json_str[start_pos:end_pos+1]
-                
-                # 再次清理和解析
-                json_str = json_str.replace('"', '"').replace('"', '"')
-                json_str = json_str.replace(''', "'").replace(''', "'")
-                
-                # 尝试修复常见的JSON格式错误
-                json_str = self._fix_common_json_errors(json_str)
-                
-                # 尝试修复截断的JSON
-                json_str = self._fix_truncated_json(json_str)
-                
-                data = json.loads(json_str)
+        Returns:
+            构建好的prompt
+        """
+        sections = "\n\n".join(
+            f"### 模型 {i}\n{self._format_model_section(m)}" for i, m in enumerate(model_infos)
+        )
+        prompt = f"""你是AI项目运营专家，你需要在模型页面中提取引流关键词以便投放到博客网站当中。
+
+以下共有{len(model_infos)}个相互独立的模型，请分别为每个模型提取关键词，每个模型只能使用其自身的信息。
+
+{sections}
+
+请严格按照系统提示中的规则为每个模型提取关键词，输出一个JSON对象，格式为：
+{{"results": [{{"model_index": 0, "keywords": [{{"keyword": "...", "dimension": "...", "reason": "..."}}]}}]}}
+results中每个模型一项，model_index与上面的模型编号对应。"""
+
+        return prompt + self._build_exclusion_text()
+    
+    def _load_response_json(self, response: str) -> Any:
+        """
+        将AI响应解析为JSON（直接解析失败时才走提取与修复的兜底逻辑）
+        
+        Args:
+            response: AI响应内容
             
-            keywords = data.get('keywords', [])
+        Returns:
+            解析后的JSON数据
             
-            # 验证关键词数量（适度放宽至3-8个以减少失败率）
-            if len(keywords) < 3:
-                print(f"⚠️ 关键词数量不足：只有{len(keywords)}个，要求至少3个")
-                return []
-            elif len(keywords) > 8:
-                print(f"⚠️ 关键词数量过多：有{len(keywords)}个，要求3-8个，取前8个")
-                keywords = keywords[:8]
-            else:
-                print(f"✅ 关键词数量符合要求：{len(keywords)}个")
+        Raises:
+            json.JSONDecodeError: 修复后仍无法解析
+        """
+        # 第一步：尝试直接解析（AI应该返回标准JSON）
+        json_str = response.strip()
+        try:
+            return json_loads(json_str)
+        except json.JSONDecodeError:
+            pass
+        
+        # 清理中文引号问题（仅在直接解析失败后进行：合法JSON的字符串值里可能本来就含有中文引号）
+        json_str = json_str.translate(_QUOTE_TRANS)
+        
+        # 尝试提取JSON部分
+        json_str = self._locate_json_span(json_str)
+        
+        # 尝试修复常见的JSON格式错误
+        json_str = self._fix_common_json_errors(json_str)
+        
+        # 尝试修复截断的JSON
+        json_str = self._fix_truncated_json(json_str)
+        
+        return json_loads(json_str)
+    
+    def _locate_json_span(self, text: str) -> str:
+        """
+        定位响应中的JSON片段（```json代码块优先，否则取最外层花括号之间的内容）
+        
+        Args:
+            text: AI响应内容
+            
+        Returns:
+            JSON片段（找不到边界时原样返回）
+        """
+        start = text.find('```json')
+        if start != -1:
+            start += 7
+            end = text.find('```', start)
+            return (text[start:end] if end != -1 else text[start:]).strip()
+        
+        # 查找JSON对象边界
+        start_pos = text.find('{')
+        if start_pos != -1:
+            end_pos = text.rfind('}')
+            if end_pos > start_pos:
+                return text[start_pos:end_pos + 1]
+        
+        return text
+    
+    def _normalize_keywords(self, keywords: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        校验关键词数量并清理、去重
+        
+        Args:
+            keywords: AI返回的原始关键词列表
             
-            # 验证和清理关键词
-            cleaned_keywords = []
-            for kw in keywords:
-                if self._validate_keyword(kw):
-                    cleaned_kw = self._clean_keyword(kw)
-                    # 只检查当前模型内的重复，不跨模型去重
-                    current_keywords = [k['keyword'] for k in cleaned_keywords]
-                    if cleaned_kw['keyword'] not in current_keywords:
-                        cleaned_keywords.append(cleaned_kw)
+        Returns:
+            清理后的关键词列表（数量不足时为空列表）
+        """
+        # 验证关键词数量（适度放宽至3-8个以减少失败率）
+        if len(keywords) < 3:
+            logger.warning("⚠️ 关键词数量不足：只有%s个，要求至少3个", len(keywords))
+            return []
+        elif len(keywords) > 8:
+            logger.warning("⚠️ 关键词数量过多：有%s个，要求3-8个，取前8个", len(keywords))
+            keywords = keywords[:8]
+        else:
+            logger.info("✅ 关键词数量符合要求：%s个", len(keywords))
+        
+        # 验证和清理关键词
+        cleaned_keywords = []
+        seen_keywords = set()  # 只检查当前模型内的重复，不跨模型去重
+        for kw in keywords:
+            if self._validate_keyword(kw):
+                cleaned_kw = self._clean_keyword(kw)
+                keyword = cleaned_kw['keyword']
+                if keyword in seen_keywords:
+                    continue
+                seen_keywords.add(keyword)
+                cleaned_keywords.append(cleaned_kw)
+        
+        return cleaned_keywords
+    
+    def _parse_keywords_response(self, response: str) -> List[Dict[str, str]]:
+        """
+        解析AI响应中的关键词JSON
+        
+        Args:
+            response: AI响应内容
             
-            return cleaned_keywords
+        Returns:
+            关键词列表
+        """
+        try:
+            data = self._load_response_json(response)
+            return self._normalize_keywords(data.get('keywords', []))
             
         except json.JSONDecodeError as e:
-            print(f"❌ JSON解析失败: {e}")
-            print(f"📝 AI完整返回内容:")
-            print("=" * 80)
-            print(response[:1500] + ("..." if len(response) > 1500 else ""))
-            print("=" * 80)
-            print("💡 提示：AI可能没有按照要求的JSON格式返回")
+            logger.error("❌ JSON解析失败: %s", e)
+            logger.debug("📝 AI完整返回内容:\n%s\n%s\n%s", "=" * 80, response[:1500] + ("..." if len(response) > 1500 else ""), "=" * 80)
+            logger.info("💡 提示：AI可能没有按照要求的JSON格式返回")
             return []
         except Exception as e:
-            print(f"❌ 解析响应时出错: {e}")
-            print(f"📝 AI完整返回内容:")
-            print("=" * 80)
-            print(response[:1500] + ("..." if len(response) > 1500 else ""))
-            print("=" * 80)
+            logger.error("❌ 解析响应时出错: %s", e)
+            logger.debug("📝 AI完整返回内容:\n%s\n%s\n%s", "=" * 80, response[:1500] + ("..." if len(response) > 1500 else ""), "=" * 80)
             return []
     
+    def _parse_multi_keywords_response(self, response: str, count: int) -> Dict[int, List[Dict[str, str]]]:
+        """
+        解析多模型合并请求的响应
+        
+        Args:
+            response: AI响应内容
+            count: 本次请求包含的模型数量
+            
+        Returns:
+            {模型序号: 关键词列表}，解析失败或无效的模型不出现在结果中
+        """
+        try:
+            data = self._load_response_json(response)
+        except json.JSONDecodeError as e:
+            logger.error("❌ 多模型响应JSON解析失败: %s", e)
+            return {}
+        
+        parsed = {}
+        results = data.get('results', []) if isinstance(data, dict) else []
+        for item in results:
+            if not isinstance(item, dict):
+                continue
+            index = item.get('model_index')
+            if not isinstance(index, int) or not 0 <= index < count or index in parsed:
+                continue
+            try:
+                keywords = self._normalize_keywords(item.get('keywords') or [])
+            except Exception as e:
+                logger.error("❌ 解析模型 %s 的关键词时出错: %s", index, e)
+                continue
+            if keywords:
+                parsed[index] = keywords
+        
+        return parsed
+    
     def _validate_keyword(self, keyword_obj: Dict[str, str]) -> bool:
         """
         验证关键词对象是否有效
@@ -303,8 +594,14 @@ README内容（前800字符）：
         Returns:
             是否有效
         """
-        required_fields = ['keyword', 'dimension', 'reason']
-        return all(field in keyword_obj and keyword_obj[field].strip() for field in required_fields)
+        # 逐项短路判断：非对象元素直接丢弃，缺字段或为空时无需调用strip()
+        if not isinstance(keyword_obj, dict):
+            return False
+        keyword = keyword_obj.get('keyword')
+        dimension = keyword_obj.get('dimension')
+        reason = keyword_obj.get('reason')
+        return bool(keyword and dimension and reason
+                    and keyword.strip() and dimension.strip() and reason.strip())
     
     def _clean_keyword(self, keyword_obj: Dict[str, str]) -> Dict[str, str]:
         """
@@ -319,17 +616,17 @@ README内容（前800字符）：
         keyword = keyword_obj['keyword'].strip()
         
         # 移除括号
-        keyword = re.sub(r'[()（）]', '', keyword)
+        keyword = _RE_PAREN.sub('', keyword)
         
         # 替换空格为连字符
-        keyword = re.sub(r'\s+', '-', keyword)
+        keyword = _RE_SPACE.sub('-', keyword)
         
         # 只保留中英文、数字、连字符、点号
-        keyword = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9\.-]', '', keyword)
+        keyword = _RE_ALLOWED.sub('', keyword)
         
         # 移除连续的连字符和点号
-        keyword = re.sub(r'-+', '-', keyword)
-        keyword = re.sub(r'\.+', '.', keyword)
+        keyword = _RE_DASH.sub('-', keyword)
+        keyword = _RE_DOT.sub('.', keyword)
         
         # 移除首尾连字符和点号
         keyword = keyword.strip('-.')
@@ -339,7 +636,7 @@ README内容（前800字符）：
         if keyword.lower().startswith('v') and '.' in keyword:
             pass  # 保持原样，不再处理
         # 如果是常见的版本号格式，也保留
-        elif re.match(r'^[A-Za-z0-9]+\.[0-9]+$', keyword):
+        elif _RE_VERSION.match(keyword):
             pass  # 保持原样，如FLUX.1, GPT.4等
         
         # 品牌名称智能扩展策略
@@ -361,43 +658,62 @@ README内容（前800字符）：
         Returns:
             修复后的JSON字符串
         """
-        import re
-        
         # 修复缺失开括号的情况：},\n  "keyword" → },\n  {"keyword"
         # 匹配：},后面跟着换行和空格，然后直接是"keyword"（而不是{）
-        pattern = r'(\},\s*\n\s*)("keyword":)'
-        json_str = re.sub(pattern, r'\1{\2', json_str)
+        json_str = _RE_MISSING_OPEN.sub(r'\1{\2', json_str)
         
         # 修复多余逗号的情况：},\n  }\n] → }\n  }\n]
-        json_str = re.sub(r',(\s*\}\s*\])', r'\1', json_str)
+        json_str = _RE_TRAIL_COMMA.sub(r'\1', json_str)
         
         # 修复缺失逗号的情况：}\n  { → },\n  {
-        json_str = re.sub(r'(\})\s*\n\s*(\{)', r'\1,\n  \2', json_str)
+        json_str = _RE_MISSING_COMMA.sub(r'\1,\n  \2', json_str)
         
         return json_str
     
     def _fix_truncated_json(self, json_str: str) -> str:
-        """修复截断的JSON"""
-        import re
-        
-        # 如果JSON被截断，尝试修复
-        if not json_str.endswith('}'):
-            # 查找最后一个完整的对象
-            last_complete_obj = json_str.rfind('}')
-            if last_complete_obj != -1:
-                # 检查是否在keywords数组中
-                before_last = json_str[:last_complete_obj]
-                if '"keywords"' in before_last:
-                    # 尝试找到最后一个完整的keyword对象
-                    keyword_objects = re.findall(r'\{[^}]*"keyword"[^}]*\}', before_last)
-                    if keyword_objects:
-                        # 使用最后一个完整的keyword对象
-                        last_keyword = keyword_objects[-1]
-                        # 重新构建JSON
-                        json_str = before_last[:before_last.rfind(last_keyword)] + last_keyword + '}]}'
-                    else:
-                        # 如果没有完整的keyword对象，尝试添加缺失的结束符
-                        json_str = before_last + '}]}'
+        """
+        修复截断的JSON：单次线性扫描括号深度，保留最后一个完整的keyword对象
+        
+        Args:
+            json_str: 待修复的JSON字符串
+            
+        Returns:
+            修复后的JSON字符串
+        """
+        # 未截断或不是keywords结构时不处理
+        if json_str.endswith('}') or '"keywords"' not in json_str:
+            return json_str
+        
+        depth = 0
+        in_string = False
+        escaped = False
+        obj_start = -1
+        last_end = -1
+        
+        for i, c in enumerate(json_str):
+            if in_string:
+                # 字符串内的括号不计入深度
+                if escaped:
+                    escaped = False
+                elif c == '\\':
+                    escaped = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c == '{':
+                depth += 1
+                if depth == 2:
+                    obj_start = i
+            elif c == '}':
+                # keywords数组中的对象位于第2层
+                if depth == 2 and json_str.find('"keyword"', obj_start, i) != -1:
+                    last_end = i
+                depth -= 1
+        
+        if last_end != -1:
+            # 截掉残缺部分，补齐数组与外层对象的结束符
+            json_str = json_str[:last_end + 1] + ']}'
         
         return json_str
     
@@ -412,60 +728,15 @@ README内容（前800字符）：
         Returns:
             扩展后的关键词
         """
-        # 只对"品牌与身份"维度的关键词进行扩展
-        if dimension != "品牌与身份":
+        # 只对品牌类维度的关键词进行扩展
+        if dimension not in _BRAND_DIMENSIONS:
             return keyword
         
-        # 定义需要扩展的品牌名称列表
-        brand_names = {
-            # 中国大厂
-            "百度": "百度大模型",
-            "腾讯": "腾讯大模型", 
-            "阿里": "阿里大模型",
-            "阿里巴巴": "阿里巴巴大模型",
-            "字节": "字节大模型",
-            "字节跳动": "字节跳动大模型",
-            "华为": "华为大模型",
-            "小米": "小米大模型",
-            "快手": "快手大模型",
-            "网易": "网易大模型",
-            "京东": "京东大模型",
-            "美团": "美团大模型",
-            "滴滴": "滴滴大模型",
-            
-            # 国际大厂
-            "OpenAI": "OpenAI大模型",
-            "Google": "Google大模型", 
-            "谷歌": "谷歌大模型",
-            "Microsoft": "Microsoft大模型",
-            "微软": "微软大模型",
-            "Meta": "Meta大模型",
-            "Facebook": "Facebook大模型",
-            "Amazon": "Amazon大模型",
-            "亚马逊": "亚马逊大模型",
-            "Apple": "Apple大模型",
-            "苹果": "苹果大模型",
-            "NVIDIA": "NVIDIA大模型",
-            "英伟达": "英伟达大模型",
-            
-            # AI创业公司
-            "智谱": "智谱大模型",
-            "月之暗面": "月之暗面大模型",
-            "零一万物": "零一万物大模型",
-            "深度求索": "深度求索大模型",
-            "商汤": "商汤大模型",
-            "旷视": "旷视大模型",
-            "科大讯飞": "科大讯飞大模型",
-            "云知声": "云知声大模型",
-            "出门问问": "出门问问大模型",
-            "小冰": "小冰大模型"
-        }
-        
         # 检查是否为需要扩展的品牌名称
-        for brand, enhanced in brand_names.items():
-            if keyword == brand:
-                print(f"🔄 品牌扩展: {brand} → {enhanced}")
-                return enhanced
+        enhanced = _BRAND_MAP.get(keyword)
+        if enhanced:
+            logger.info("🔄 品牌扩展: %s → %s", keyword, enhanced)
+            return enhanced
         
         return keyword
     
@@ -480,7 +751,7 @@ README内容（前800字符）：
         Returns:
             原始结果列表（无去重）
         """
-        print("跳过关键词去重，将在CSV生成时统一去重")
+        logger.info("跳过关键词去重，将在CSV生成时统一去重")
         return keyword_results
     
     def _is_similar_keyword_exists(self, keyword: str, existing_keywords: set) -> bool:
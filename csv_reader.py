@@ -5,11 +5,24 @@ CSV模型读取器
 用于从CSV文件读取模型信息并转换为ModelInfo对象
 """
 
+import io
+import re
 import csv
-from urllib.parse import urlparse, urlunparse
-from typing import List, Dict
+import time
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlsplit, urlunsplit
+from typing import List, Dict, Optional, Tuple
+import aiohttp
 from models import ModelInfo
-from hf_scraper import scrape_hf_model_sync
+from hf_scraper import HFScraper, scrape_hf_model, scrape_hf_model_sync
+from rate_limiter import AsyncTokenBucket
+from hf_cache import ScrapeCache, PageCache, DEFAULT_DB_PATH, DEFAULT_TTL
+
+logger = logging.getLogger(__name__)
 
 # ===== 全局配置 =====
 # 只需要在这里修改CSV文件路径，其他地方会自动使用
@@ -17,21 +30,107 @@ DEFAULT_CSV_FILE = "高亮词需求1113-v2.csv"
 # ===================
 
 
+# 需要移除的路径后缀（路径已去掉结尾的/，单个正则一次匹配）
+_RE_URL_SUFFIX = re.compile(r'/(?:model-inference|inference|files|tree)$')
+
+
+def _get_field(row: list, index: Optional[int], empty=''):
+    """
+    按列下标取值，列不存在或该行列数不足时返回空值
+    
+    Args:
+        row: CSV行（字段为str或未解码的bytes）
+        index: 列下标（None表示表头中没有该列）
+        empty: 取不到值时返回的空值（与字段类型一致）
+        
+    Returns:
+        字段值
+    """
+    if index is None or index >= len(row):
+        return empty
+    return row[index]
+
+
+@lru_cache(maxsize=4096)
+def _clean_url(url: str) -> str:
+    """
+    清理URL（纯函数，结果按URL缓存，重复出现的URL无需重新解析）
+    
+    Args:
+        url: 原始URL
+        
+    Returns:
+        清理后的URL
+    """
+    if not url:
+        return url
+    
+    # 解析URL
+    parsed = urlsplit(url)
+    
+    # 移除路径后缀
+    path = _RE_URL_SUFFIX.sub('', parsed.path.rstrip('/'), count=1)
+    
+    # 重新构建URL
+    cleaned_url = urlunsplit((parsed.scheme, parsed.netloc, path, parsed.query, parsed.fragment))
+    
+    return cleaned_url.rstrip('/')
+
+
 class CSVModelReader:
     """CSV模型读取器"""
     
-    def __init__(self, csv_file: str = None, delay: float = 0.5, token: str = None):
+    def __init__(self, csv_file: str = DEFAULT_CSV_FILE, delay: float = 0.5, token: str = None,
+                 max_workers: int = 8, browser_profile_dir: Optional[str] = None,
+                 static_first: bool = False, scrape_cache_enabled: bool = True,
+                 scrape_cache_path: str = DEFAULT_DB_PATH, scrape_cache_ttl: Optional[float] = DEFAULT_TTL):
         """
         初始化CSV读取器
         
         Args:
-            csv_file: CSV文件路径（None时使用全局配置）
-            delay: 爬取延迟时间（秒）
+            csv_file: CSV文件路径（默认使用全局配置，传入None时同样回退到全局配置）
+            delay: 同一站点两次爬取请求之间的最小间隔（秒）
             token: 可选的认证token
+            max_workers: 并发爬取详细信息的最大页面数
+            browser_profile_dir: 浏览器用户数据目录（指定时复用持久化的浏览器配置，None时每次使用临时上下文）
+            static_first: 是否先直接请求页面HTML，服务端HTML中没有README时才使用浏览器
+            scrape_cache_enabled: 是否按URL缓存爬取结果（static_first时同时缓存请求到的页面HTML）
+            scrape_cache_path: 爬取缓存的SQLite文件路径
+            scrape_cache_ttl: 爬取缓存有效期（秒），None表示永不过期
         """
         self.csv_file = csv_file or DEFAULT_CSV_FILE
         self.delay = delay
         self.token = token
+        self.max_workers = max_workers
+        self.browser_profile_dir = browser_profile_dir
+        self.static_first = static_first
+        self.scrape_cache = ScrapeCache(scrape_cache_path, scrape_cache_ttl) if scrape_cache_enabled else None
+        self.page_cache = PageCache(scrape_cache_path) if scrape_cache_enabled and static_first else None
+        
+        # 按站点限速：记录每个host下一次允许发起请求的时间
+        self._host_next_slot: Dict[str, float] = {}
+        self._host_lock = threading.Lock()
+        # 异步爬取时的按站点限速器 {host: AsyncTokenBucket}
+        self._host_limiters: Dict[str, AsyncTokenBucket] = {}
+    
+    def _wait_for_host_slot(self, url: str):
+        """
+        按站点限速，保证同一host的请求间隔不小于delay（线程安全）
+        
+        Args:
+            url: 即将请求的URL
+        """
+        if self.delay <= 0:
+            return
+        
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            now = time.monotonic()
+            slot = max(now, self._host_next_slot.get(host, now))
+            self._host_next_slot[host] = slot + self.delay
+        
+        if slot > now:
+            time.sleep(slot - now)
     
     def clean_url(self, url: str) -> str:
         """
@@ -43,46 +142,9 @@ class CSVModelReader:
         Returns:
             清理后的URL
         """
-        if not url:
-            return url
-        
-        # 解析URL
-        parsed = urlparse(url)
-        
-        # 获取路径部分
-        path = parsed.path.rstrip('/')
-        
-        # 需要移除的路径后缀列表
-        suffixes_to_remove = [
-            '/model-inference',
-            '/model-inference/',
-            '/inference',
-            '/inference/',
-            '/files',
-            '/files/',
-            '/tree',
-            '/tree/',
-        ]
-        
-        # 移除路径后缀
-        for suffix in suffixes_to_remove:
-            if path.endswith(suffix):
-                path = path[:-len(suffix)]
-                break
-        
-        # 重新构建URL
-        cleaned_url = urlunparse((
-            parsed.scheme,
-            parsed.netloc,
-            path,
-            parsed.params,
-            parsed.query,
-            parsed.fragment
-        ))
-        
-        return cleaned_url.rstrip('/')
+        return _clean_url(url)
     
-    def read_csv_data(self, max_models: int = None) -> List[Dict]:
+    def read_csv_data(self, max_models: int = None) -> List[Tuple[str, str]]:
         """
         从CSV文件读取模型数据
         
@@ -90,49 +152,78 @@ class CSVModelReader:
             max_models: 最大模型数量（None表示全部）
             
         Returns:
-            模型数据列表
+            模型数据列表，每项为(项目名称, 项目网址)
         """
-        print(f"📖 开始读取CSV文件: {self.csv_file}")
+        logger.info("📖 开始读取CSV文件: %s", self.csv_file)
         
         models = []
         try:
-            with open(self.csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            with open(self.csv_file, 'rb') as f:
+                raw = f.read()
+            
+            # 没有引号和\r时直接在字节上逐行split（与csv.reader结果一致），只解码通过筛选的字段；
+            # 否则整体解码后交给csv.reader
+            fast_path = b'"' not in raw and b'\r' not in raw
+            if fast_path:
+                lines = raw.split(b'\n')
+                header = lines[0].decode('utf-8').split(',')
+                reader = (line.split(b',') for line in islice(lines, 1, None))
+                approved, public, empty = b'2', b'1', b''
+            else:
+                reader = csv.reader(io.StringIO(raw.decode('utf-8'), newline=''))
+                header = next(reader, [])
+                approved, public, empty = '2', '1', ''
+            
+            # 列索引只解析一次，之后按下标取值（缺失的列为None）
+            column_index = {}
+            for i, name in enumerate(header):
+                column_index.setdefault(name, i)
+            status_idx = column_index.get('审核状态')
+            public_idx = column_index.get('是否公开')
+            name_idx = column_index.get('项目名称')
+            # 兼容旧版CSV：项目名称为空时使用"想买名称"列
+            alt_name_idx = column_index.get('想买名称')
+            url_idx = column_index.get('项目网址')
+            
+            if status_idx is not None and public_idx is not None:
+                min_len = max(status_idx, public_idx) + 1
                 
                 for row in reader:
-                    # 检查审核状态和是否公开
-                    audit_status = row.get('审核状态', '')
-                    is_public = row.get('是否公开', '')
+                    # 跳过列数不足的行
+                    if len(row) < min_len:
+                        continue
                     
-                    # 只处理审核通过且公开的模型
-                    if audit_status == '2' and is_public == '1':
-                        models.append(row)
+                    # 只处理审核通过且公开的模型，过滤后才取名称和网址
+                    if row[status_idx] == approved and row[public_idx] == public:
+                        project_name = _get_field(row, name_idx, empty) or _get_field(row, alt_name_idx, empty)
+                        models.append((project_name, _get_field(row, url_idx, empty)))
                         
                         # 限制数量
                         if max_models and len(models) >= max_models:
                             break
             
-            print(f"✅ 从CSV读取到 {len(models)} 个符合条件的模型")
+            if fast_path:
+                models = [(name.decode('utf-8'), url.decode('utf-8')) for name, url in models]
+            
+            logger.info("✅ 从CSV读取到 %s 个符合条件的模型", len(models))
             return models
             
         except Exception as e:
-            print(f"❌ 读取CSV文件失败: {e}")
+            logger.error("❌ 读取CSV文件失败: %s", e)
             return []
     
-    def convert_csv_to_model_info(self, csv_model: Dict) -> ModelInfo:
+    def convert_csv_to_model_info(self, csv_model: Tuple[str, str]) -> ModelInfo:
         """
         将CSV数据转换为ModelInfo对象
         
         Args:
-            csv_model: CSV行数据
+            csv_model: read_csv_data返回的(项目名称, 项目网址)
             
         Returns:
             ModelInfo对象
         """
-        # 提取基本信息
-        # 兼容不同的列名：优先使用"项目名称"，如果没有则使用"想买名称"
-        project_name = csv_model.get('项目名称', '') or csv_model.get('想买名称', '')
-        project_url = csv_model.get('项目网址', '')
+        # 提取基本信息（项目名称已在读取时兼容"想买名称"列）
+        project_name, project_url = csv_model
         
         # 清理URL，去掉/model-inference等路径后缀
         cleaned_url = self.clean_url(project_url)
@@ -158,56 +249,211 @@ class CSVModelReader:
         Returns:
             ModelInfo对象列表
         """
-        print(f"📖 开始从CSV文件获取模型信息 (最大数量: {max_models or '全部'})")
+        return asyncio.run(self.crawl_models_async(max_models, fetch_details))
+
+    async def crawl_models_async(self, max_models: int = None, fetch_details: bool = False) -> List[ModelInfo]:
+        """
+        从CSV文件爬取模型信息（异步版本，所有页面在同一事件循环中并发爬取）
+
+        Args:
+            max_models: 最大模型数量（None表示全部）
+            fetch_details: 是否获取详细信息（README和标签）
+
+        Returns:
+            ModelInfo对象列表
+        """
+        logger.info("📖 开始从CSV文件获取模型信息 (最大数量: %s)", max_models or '全部')
 
         # 从CSV读取基础数据
         csv_models = self.read_csv_data(max_models)
         if not csv_models:
             return []
 
-        # 转换为ModelInfo对象
-        models = []
-        for csv_model in csv_models:
-            try:
-                model_info = self.convert_csv_to_model_info(csv_model)
+        # 转换为ModelInfo对象（每行只是清理URL并构造对象，直接顺序转换）
+        converted = [self._convert_one(csv_model) for csv_model in csv_models]
+        models = [model_info for model_info in converted if model_info is not None]
 
-                # 如果需要获取详细信息，则调用爬虫
-                if fetch_details:
-                    model_info = self.get_model_detail_from_scraper(model_info)
+        if fetch_details and models:
+            # 相同URL只爬取一次，结果再复制给其余重复的行
+            unique_models: Dict[str, ModelInfo] = {}
+            for model_info in models:
+                unique_models.setdefault(model_info.url, model_info)
 
-                models.append(model_info)
+            # 并发爬取详细信息（总并发数受max_workers限制，按站点限速），
+            # 所有页面共享同一个浏览器上下文和HTTP会话
+            semaphore = asyncio.Semaphore(self.max_workers)
+            async with HFScraper(self.token, self.browser_profile_dir, self.static_first,
+                                 self.max_workers) as scraper:
+                await asyncio.gather(
+                    *(self._fetch_detail_async(model_info, semaphore, scraper.context, scraper.session)
+                      for model_info in unique_models.values())
+                )
 
-            except Exception as e:
-                print(f"⚠️  转换模型信息失败: {e}")
-                continue
+            for model_info in models:
+                scraped = unique_models[model_info.url]
+                if scraped is not model_info:
+                    model_info.readme = scraped.readme
+                    model_info.tags = scraped.tags
 
-        print(f"✅ 成功获取 {len(models)} 个模型信息")
+        logger.info("✅ 成功获取 %s 个模型信息", len(models))
         return models
 
-    def get_model_detail_from_scraper(self, model_info: ModelInfo) -> ModelInfo:
+    def _convert_one(self, csv_model: Tuple[str, str]) -> Optional[ModelInfo]:
+        """
+        转换单条CSV数据
+
+        Args:
+            csv_model: read_csv_data返回的(项目名称, 项目网址)
+
+        Returns:
+            ModelInfo对象，转换失败时为None
+        """
+        try:
+            return self.convert_csv_to_model_info(csv_model)
+        except Exception as e:
+            logger.warning("⚠️  转换模型信息失败: %s", e)
+            return None
+
+    async def _fetch_detail_async(self, model_info: ModelInfo, semaphore: asyncio.Semaphore,
+                                  context=None, session: Optional[aiohttp.ClientSession] = None) -> ModelInfo:
+        """
+        在并发限制内爬取单个模型的详细信息
+
+        Args:
+            model_info: 基础模型信息
+            semaphore: 限制同时爬取页面数的信号量
+            context: 共享的浏览器上下文
+            session: 共享的aiohttp会话（None时只使用浏览器）
+
+        Returns:
+            包含详细信息的ModelInfo对象
+        """
+        async with semaphore:
+            return await self.get_model_detail_from_scraper_async(model_info, context, session)
+
+    def _get_host_limiter(self, url: str) -> AsyncTokenBucket:
+        """
+        获取URL所属站点的限速器（每delay秒放行一个请求，同一站点共享）
+
+        Args:
+            url: 即将请求的URL
+
+        Returns:
+            站点对应的令牌桶
+        """
+        host = urlsplit(url).netloc
+        limiter = self._host_limiters.get(host)
+        if limiter is None:
+            limiter = self._host_limiters[host] = AsyncTokenBucket(rate=1, period=self.delay, capacity=1)
+        return limiter
+
+    def _get_cached_scrape(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        读取缓存的爬取结果
+
+        Args:
+            url: 模型页面URL
+
+        Returns:
+            爬取结果字典，未启用缓存或未命中时为None
+        """
+        if self.scrape_cache is None:
+            return None
+        return self.scrape_cache.get(url)
+
+    def _save_cached_scrape(self, url: str, scraped_data: Dict[str, str]):
+        """
+        缓存成功的爬取结果（出错或README为空的结果不缓存，下次重新爬取）
+        README为空多为渲染超时或页面停留在/model-inference等临时失败，缓存后会在TTL内一直返回空README
+
+        Args:
+            url: 模型页面URL
+            scraped_data: 爬取结果字典（调用方只传入同时请求了README和标签的完整结果）
+        """
+        if (self.scrape_cache is not None and scraped_data.get('name') != 'Error'
+                and scraped_data.get('readme')):
+            self.scrape_cache.put(url, scraped_data)
+
+    async def get_model_detail_from_scraper_async(self, model_info: ModelInfo, context=None,
+                                                  session: Optional[aiohttp.ClientSession] = None,
+                                                  want_readme: bool = True, want_tags: bool = True) -> ModelInfo:
+        """
+        使用爬虫获取模型的详细信息（异步版本）
+
+        Args:
+            model_info: 基础模型信息
+            context: 共享的浏览器上下文（None时单独启动浏览器）
+            session: 共享的aiohttp会话（传入时先尝试直接请求HTML）
+            want_readme: 是否获取README（False时保留model_info原有的README）
+            want_tags: 是否获取标签（False时保留model_info原有的标签）
+
+        Returns:
+            包含详细信息的ModelInfo对象
+        """
+        logger.debug("正在使用爬虫获取模型详细信息: %s", model_info.project_name)
+
+        try:
+            # 命中缓存时无需限速和爬取
+            scraped_data = self._get_cached_scrape(model_info.url)
+            if scraped_data is None:
+                # 按站点限速后在当前事件循环中爬取
+                if self.delay > 0:
+                    await self._get_host_limiter(model_info.url).acquire()
+                scraped_data = await scrape_hf_model(model_info.url, self.token, context, session,
+                                                     want_readme, want_tags, self.page_cache)
+                # 只缓存完整的结果，避免之后的完整请求命中缺字段的缓存
+                if want_readme and want_tags:
+                    self._save_cached_scrape(model_info.url, scraped_data)
+
+            # 更新模型信息（只更新请求的字段）
+            if want_readme:
+                model_info.readme = scraped_data.get('readme', '')
+            if want_tags:
+                model_info.tags = scraped_data.get('tags', [])
+
+            logger.debug("✅ 成功获取模型信息: README长度=%s, 标签数=%s", len(model_info.readme), len(model_info.tags))
+            return model_info
+
+        except Exception as e:
+            logger.error("❌ 爬取模型信息失败: %s", e)
+            # 返回原始模型信息
+            return model_info
+
+    def get_model_detail_from_scraper(self, model_info: ModelInfo, want_readme: bool = True,
+                                      want_tags: bool = True) -> ModelInfo:
         """
         使用爬虫获取模型的详细信息
 
         Args:
             model_info: 基础模型信息
+            want_readme: 是否获取README（False时保留model_info原有的README）
+            want_tags: 是否获取标签（False时保留model_info原有的标签）
 
         Returns:
             包含详细信息的ModelInfo对象
         """
-        print(f"正在使用爬虫获取模型详细信息: {model_info.project_name}")
+        logger.debug("正在使用爬虫获取模型详细信息: %s", model_info.project_name)
 
         try:
-            # 使用爬虫获取详细信息
-            scraped_data = scrape_hf_model_sync(model_info.url, self.token)
+            # 命中缓存时无需限速和爬取，否则使用爬虫获取详细信息
+            scraped_data = self._get_cached_scrape(model_info.url)
+            if scraped_data is None:
+                self._wait_for_host_slot(model_info.url)
+                scraped_data = scrape_hf_model_sync(model_info.url, self.token, want_readme, want_tags)
+                # 只缓存完整的结果，避免之后的完整请求命中缺字段的缓存
+                if want_readme and want_tags:
+                    self._save_cached_scrape(model_info.url, scraped_data)
 
-            # 更新模型信息
-            model_info.readme = scraped_data.get('readme', '')
-            model_info.tags = scraped_data.get('tags', [])
+            # 更新模型信息（只更新请求的字段）
+            if want_readme:
+                model_info.readme = scraped_data.get('readme', '')
+            if want_tags:
+                model_info.tags = scraped_data.get('tags', [])
 
-            print(f"✅ 成功获取模型信息: README长度={len(model_info.readme)}, 标签数={len(model_info.tags)}")
+            logger.debug("✅ 成功获取模型信息: README长度=%s, 标签数=%s", len(model_info.readme), len(model_info.tags))
             return model_info
 
         except Exception as e:
-            print(f"❌ 爬取模型信息失败: {e}")
+            logger.error("❌ 爬取模型信息失败: %s", e)
             # 返回原始模型信息
             return model_info
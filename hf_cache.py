@@ -0,0 +1,143 @@
+"""
+爬取缓存 - 按URL缓存scrape_hf_model的结果和直接请求到的页面HTML（SQLite，重复运行时跳过网络和浏览器）
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional
+
+from models import json_loads
+
+logger = logging.getLogger(__name__)
+
+# 缓存数据库路径与默认有效期（秒）
+DEFAULT_DB_PATH = os.path.join("cache", "scrape_cache.sqlite")
+DEFAULT_TTL = 86400
+# 页面HTML的默认有效期（秒），比爬取结果短，页面更新后能较快重新获取
+DEFAULT_PAGE_TTL = 3600
+
+
+class ScrapeCache:
+    """爬取结果缓存（url为主键，payload为结果JSON，ts为写入时间）"""
+
+    # 数据表名（子类使用各自的表，可与本类共用同一个数据库文件）
+    TABLE = "cache"
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, ttl: Optional[float] = DEFAULT_TTL):
+        """
+        初始化缓存（数据库在首次读写时才创建）
+
+        Args:
+            path: SQLite数据库文件路径
+            ttl: 缓存有效期（秒），None表示永不过期
+        """
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库连接并建表（调用方需持有锁）"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL模式下读写互不阻塞，多个进程同时爬取也能共享同一缓存
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} (url TEXT PRIMARY KEY, payload BLOB, ts INTEGER)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _encode(self, value) -> str:
+        """序列化要写入payload列的值"""
+        return json.dumps(value, ensure_ascii=False)
+
+    def _decode(self, payload):
+        """解析payload列的值（无法解析时抛出ValueError）"""
+        return json_loads(payload)
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        读取缓存的爬取结果，不存在、已过期或无法解析时返回None
+
+        Args:
+            url: 模型页面URL
+
+        Returns:
+            爬取结果字典
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    f"SELECT payload, ts FROM {self.TABLE} WHERE url = ?", (url,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            return None
+
+        payload, ts = row
+        if self.ttl is not None and time.time() - ts > self.ttl:
+            return None
+
+        try:
+            return self._decode(payload)
+        except ValueError:
+            return None
+
+    def put(self, url: str, result: Dict[str, str]):
+        """
+        写入爬取结果（同一URL覆盖旧结果）
+
+        Args:
+            url: 模型页面URL
+            result: 爬取结果字典
+        """
+        payload = self._encode(result)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.TABLE} (url, payload, ts) VALUES (?, ?, ?)",
+                    (url, payload, int(time.time()))
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("⚠️  写入爬取缓存失败: %s", e)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PageCache(ScrapeCache):
+    """页面HTML缓存（直接请求到的服务端渲染HTML，命中时只需重新解析，无需请求）"""
+
+    TABLE = "pages"
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, ttl: Optional[float] = DEFAULT_PAGE_TTL):
+        """
+        初始化缓存（数据库在首次读写时才创建）
+
+        Args:
+            path: SQLite数据库文件路径
+            ttl: 缓存有效期（秒），None表示永不过期
+        """
+        super().__init__(path, ttl)
+
+    def _encode(self, value: str) -> str:
+        return value
+
+    def _decode(self, payload) -> str:
+        return payload
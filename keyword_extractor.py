@@ -3,15 +3,26 @@
 """
 import os
 import argparse
+import asyncio
+import csv
 import json
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set
 import traceback
 
-from models import ModelInfo, KeywordResult, save_to_json, load_from_json
+from models import ModelInfo, KeywordResult, save_to_json, load_from_json, WRITE_BUFFER_SIZE
 from csv_reader import CSVModelReader
 from ai_extractor import KeywordExtractor
 from multi_platform_extractor import MultiPlatformExtractorSync
+from log_utils import setup_logging
+
+# 后台写文件的线程数与最多排队的写入任务数（超出时提交方阻塞等待，避免待写数据无限堆积）
+IO_WORKERS = 4
+IO_MAX_PENDING = 8
 
 
 def detect_available_platforms() -> int:
@@ -31,10 +42,94 @@ def detect_available_platforms() -> int:
     return available_count
 
 
+@lru_cache(maxsize=4096)
+def _ai_url(model_url: str) -> str:
+    """将URL中的gitcode.com替换为ai.gitcode.com（结果按URL缓存）"""
+    return model_url.replace('gitcode.com', 'ai.gitcode.com')
+
+
+@lru_cache(maxsize=4096)
+def _report_model_name(model_url: str) -> str:
+    """报告中显示的模型名称：URL的最后两段（结果按URL缓存）"""
+    return '/'.join(model_url.split('/')[-2:]) if '/' in model_url else model_url
+
+
+@lru_cache(maxsize=4096)
+def _csv_project_name(model_url: str) -> str:
+    """CSV中的项目名称：包含用户名/项目名格式时取最后两部分（结果按URL缓存）"""
+    parts = model_url.rstrip('/').split('/')
+    if model_url.count('/') >= 2 and len(parts) >= 2:
+        return '/'.join(parts[-2:])
+    return model_url.split('/')[-1]
+
+
+def _write_text(path: str, content: str):
+    """写入文本文件"""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(content)
+
+
+def _write_csv(path: str, header: Sequence[str], rows: Iterable[Sequence[str]]):
+    """写入CSV文件（rows为空时只创建空文件，不写表头）"""
+    with open(path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        if rows:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+def _group_keywords_by_dimension(keyword_results: List[KeywordResult]) -> Dict[str, Set[str]]:
+    """
+    按维度分组关键词，插入时即去重
+    
+    Args:
+        keyword_results: 关键词结果列表
+        
+    Returns:
+        维度 -> 该维度下的关键词集合
+    """
+    keywords_by_dimension = defaultdict(set)
+    for result in keyword_results:
+        for kw in result.keywords:
+            keywords_by_dimension[kw['dimension']].add(kw['keyword'])
+    return keywords_by_dimension
+
+
+def _iter_dedup_results(keyword_results: List[KeywordResult],
+                        key: Optional[Callable[[str], str]] = None) -> Iterator[KeywordResult]:
+    """
+    按生成顺序对所有结果的关键词整体去重（保留先生成的），逐个产出去重后的结果
+
+    Args:
+        keyword_results: 关键词结果列表
+        key: 比较关键词前的归一化函数（如str.lower表示不区分大小写），None时按原文比较
+
+    Yields:
+        只包含未出现过关键词的新结果对象（关键词全部重复的结果被跳过）
+    """
+    used = set()
+    used_add = used.add
+
+    for result in keyword_results:
+        filtered_keywords = []
+        filtered_append = filtered_keywords.append
+
+        for kw in result.keywords:
+            keyword = kw['keyword']
+            dedup_key = key(keyword) if key is not None else keyword
+            if dedup_key not in used:
+                used_add(dedup_key)
+                filtered_append(kw)
+
+        if filtered_keywords:
+            yield KeywordResult(model_url=result.model_url, keywords=filtered_keywords)
+
+
 class ModelKeywordExtractor:
     """模型关键词提取主程序"""
     
-    def __init__(self, output_dir: str = "output", token: Optional[str] = None, use_multi_platform: bool = False):
+    def __init__(self, output_dir: str = "output", token: Optional[str] = None, use_multi_platform: bool = False,
+                 llm_cache_enabled: bool = True):
         """
         初始化提取器
         
@@ -42,27 +137,58 @@ class ModelKeywordExtractor:
             output_dir: 输出目录
             token: 可选的认证token
             use_multi_platform: 是否使用多平台并发提取
+            llm_cache_enabled: 是否启用提取器的LLM响应缓存（内容未变的模型不再请求LLM）
         """
         self.output_dir = output_dir
         self.token = token
         self.use_multi_platform = use_multi_platform
+        self.models_cache_file = os.path.join(output_dir, "models_cache.json")
         self.ensure_output_dir()
         
         # 初始化组件
         self.csv_reader = CSVModelReader(delay=0.1, token=token)  # CSV读取器，集成爬虫功能
         
+        # 后台写文件：写盘与后续步骤重叠，run_full_pipeline结束前统一等待
+        self._io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="output-io")
+        self._io_slots = threading.BoundedSemaphore(IO_MAX_PENDING)
+        self._io_futures: List[Future] = []
+        
         # 选择提取器
         if use_multi_platform:
             print("🚀 使用多平台并发提取器")
-            self.extractor = MultiPlatformExtractorSync()
+            self.extractor = MultiPlatformExtractorSync(llm_cache_enabled=llm_cache_enabled)
         else:
             print("📡 使用单平台提取器")
-            self.extractor = KeywordExtractor()
+            self.extractor = KeywordExtractor(llm_cache_enabled=llm_cache_enabled)
+    
+    def _submit_io(self, fn: Callable, *args):
+        """
+        提交后台写文件任务（排队任务已满时阻塞，直到有任务完成）
+        
+        Args:
+            fn: 写文件函数
+            *args: 传给fn的参数（提交后不应再修改）
+        """
+        self._io_slots.acquire()
+        try:
+            future = self._io_executor.submit(fn, *args)
+        except BaseException:
+            self._io_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._io_slots.release())
+        self._io_futures.append(future)
+    
+    def flush_io(self):
+        """等待所有后台写文件任务完成，有写入失败时抛出第一个异常"""
+        futures, self._io_futures = self._io_futures, []
+        errors = [f.exception() for f in futures]
+        for error in errors:
+            if error is not None:
+                raise error
     
     def ensure_output_dir(self):
         """确保输出目录存在"""
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
     
     def run_full_pipeline(self, max_models: int = 100, force_crawl: bool = False, use_csv: bool = True):
         """
@@ -107,8 +233,13 @@ class ModelKeywordExtractor:
             
             # 步骤4: 生成报告
             report_file = os.path.join(run_output_dir, f"report_{timestamp}.md")
+            csv_file = report_file.replace('.md', '.csv')
+            txt_file = report_file.replace('.md', '_keywords.txt')
             self.generate_report(keyword_results, final_results, report_file, total_attempted=len(models))
             
+            # 等待所有输出文件写完再汇报
+            self.flush_io()
+            
             print(f"\n✅ 提取完成！")
             print(f"📊 统计信息:")
             print(f"   📝 CSV读取模型数: {len(models)}")
@@ -121,12 +252,18 @@ class ModelKeywordExtractor:
             print(f"   - 原始关键词: {keywords_file}")
             print(f"   - 去重关键词: {dedup_file}")
             print(f"   - 分析报告: {report_file}")
-            print(f"   - CSV导出: {report_file.replace('.md', '.csv')}")
-            print(f"   - 关键词列表: {report_file.replace('.md', '_keywords.txt')}")
+            print(f"   - CSV导出: {csv_file}")
+            print(f"   - 关键词列表: {txt_file}")
             
         except Exception as e:
             print(f"❌ 运行过程中出现错误: {e}")
             traceback.print_exc()
+        finally:
+            # 提前返回或出错时也要等待已提交的写入
+            try:
+                self.flush_io()
+            except Exception as e:
+                print(f"❌ 写入输出文件失败: {e}")
     
     def crawl_or_load_models(self, max_models: int, force_crawl: bool, output_file: str, use_csv: bool = True) -> List[ModelInfo]:
         """
@@ -143,20 +280,21 @@ class ModelKeywordExtractor:
         """
         print(f"\n📖 步骤1: 从CSV文件获取模型信息 (目标数量: {max_models})")
         
-        # 检查是否存在缓存文件
-        cache_file = os.path.join(self.output_dir, "models_cache.json")
+        # 直接尝试读取缓存文件，不存在时load_from_json返回空列表（省去单独的存在性检查）
+        cache_file = self.models_cache_file
         
-        if not force_crawl and os.path.exists(cache_file):
-            print("发现缓存文件，正在加载...")
+        if not force_crawl:
             try:
                 cached_data = load_from_json(cache_file)
+                if cached_data:
+                    print("发现缓存文件，正在加载...")
                 if cached_data and len(cached_data) >= max_models:
                     models = [ModelInfo.from_dict(data) for data in cached_data[:max_models]]
                     print(f"✅ 从缓存加载了 {len(models)} 个模型信息")
                     
                     # 保存到输出文件
                     model_dicts = [model.to_dict() for model in models]
-                    save_to_json(model_dicts, output_file)
+                    self._submit_io(save_to_json, model_dicts, output_file)
                     
                     return models
             except Exception as e:
@@ -173,8 +311,8 @@ class ModelKeywordExtractor:
         if models:
             # 保存到缓存和输出文件
             model_dicts = [model.to_dict() for model in models]
-            save_to_json(model_dicts, cache_file)
-            save_to_json(model_dicts, output_file)
+            self._submit_io(save_to_json, model_dicts, cache_file)
+            self._submit_io(save_to_json, model_dicts, output_file)
             print(f"✅ 成功读取 {len(models)} 个模型信息")
         else:
             print("❌ 未能读取到任何模型信息")
@@ -214,13 +352,13 @@ class ModelKeywordExtractor:
             print("❌ 没有有效的模型用于关键词提取")
             return []
         
-        # 批量提取关键词
-        keyword_results = self.extractor.extract_batch_keywords(valid_models)
+        # 批量提取关键词（在一个事件循环内并发请求）
+        keyword_results = asyncio.run(self._extract_batch_and_close(valid_models))
         
         if keyword_results:
             # 保存结果
             results_data = [result.to_dict() for result in keyword_results]
-            save_to_json(results_data, output_file)
+            self._submit_io(save_to_json, results_data, output_file)
             print(f"✅ 成功提取 {len(keyword_results)} 个模型的关键词")
             
             # 显示失败统计（如果有失败的话）
@@ -234,6 +372,21 @@ class ModelKeywordExtractor:
         
         return keyword_results
     
+    async def _extract_batch_and_close(self, models: List[ModelInfo]) -> List[KeywordResult]:
+        """
+        批量提取关键词，结束后在同一事件循环内关闭提取器的HTTP连接池
+        
+        Args:
+            models: 模型信息列表
+            
+        Returns:
+            关键词提取结果列表
+        """
+        try:
+            return await self.extractor.extract_batch_keywords_async(models)
+        finally:
+            await self.extractor.aclose()
+    
     def deduplicate_keywords(self, keyword_results: List[KeywordResult], output_file: str) -> List[KeywordResult]:
         """
         关键词去重
@@ -253,7 +406,7 @@ class ModelKeywordExtractor:
         if dedup_results:
             # 保存去重结果
             results_data = [result.to_dict() for result in dedup_results]
-            save_to_json(results_data, output_file)
+            self._submit_io(save_to_json, results_data, output_file)
             
             # 统计信息
             original_count = sum(len(r.keywords) for r in keyword_results)
@@ -274,30 +427,7 @@ class ModelKeywordExtractor:
         Returns:
             去重后的结果列表
         """
-        # 用于去重的已使用关键词集合（保留先生成的）
-        used_keywords = set()
-        dedup_results = []
-        
-        for result in keyword_results:
-            filtered_keywords = []
-            
-            for kw in result.keywords:
-                keyword = kw['keyword']
-                
-                # 去重：保留先生成的关键词
-                if keyword not in used_keywords:
-                    used_keywords.add(keyword)
-                    filtered_keywords.append(kw)
-            
-            if filtered_keywords:
-                # 创建新的结果对象，包含去重后的关键词
-                dedup_result = KeywordResult(
-                    model_url=result.model_url,
-                    keywords=filtered_keywords
-                )
-                dedup_results.append(dedup_result)
-        
-        return dedup_results
+        return list(_iter_dedup_results(keyword_results))
     
     def generate_report(self, original_results: List[KeywordResult], final_results: List[KeywordResult], output_file: str, total_attempted: int = None):
         """
@@ -310,36 +440,42 @@ class ModelKeywordExtractor:
         """
         print(f"\n📋 步骤4: 生成分析报告")
         
+        # 同目录下的CSV与纯文本文件路径
+        csv_file = output_file.replace('.md', '.csv')
+        txt_file = output_file.replace('.md', '_keywords.txt')
+        
         # 先进行CSV去重，获取真实的去重后数据
         csv_dedup_results = self._csv_deduplicate_keywords(final_results)
         
-        # 统计分析
+        # 统计分析：每份数据只遍历一次，同时收集所需的全部统计
         total_models = len(final_results)
-        total_keywords = sum(len(r.keywords) for r in csv_dedup_results)  # 使用CSV去重后的数据
-        original_keywords = sum(len(r.keywords) for r in original_results)
-        
-        # 按维度统计（使用CSV去重后的结果）
-        dimension_stats = {}
-        final_keywords = []
         
+        # CSV去重后的数据：维度分布与最终关键词频率
+        dimension_stats = Counter()
+        final_keyword_freq = Counter()
         for result in csv_dedup_results:
             for kw in result.keywords:
-                dimension = kw['dimension']
-                dimension_stats[dimension] = dimension_stats.get(dimension, 0) + 1
-                final_keywords.append(kw['keyword'])
+                dimension_stats[kw['dimension']] += 1
+                final_keyword_freq[kw['keyword']] += 1
+        total_keywords = sum(dimension_stats.values())
         
         # 原始数据统计（用于高频关键词分析）
-        original_keyword_freq = {}
+        original_keyword_freq = Counter()
+        update_original = original_keyword_freq.update
         for result in original_results:
-            for kw in result.keywords:
-                keyword = kw['keyword']
-                original_keyword_freq[keyword] = original_keyword_freq.get(keyword, 0) + 1
+            update_original(kw['keyword'] for kw in result.keywords)
+        original_keywords = sum(original_keyword_freq.values())
+        
+        # 最终结果按维度分组的关键词（用于所有关键词列表，与纯文本列表共用）
+        keywords_by_dimension = _group_keywords_by_dimension(final_results)
         
         # 使用传入的尝试总数，如果没有则使用成功数量
         attempted_models = total_attempted if total_attempted else total_models
         
-        # 生成Markdown报告
-        report_content = f"""# 模型关键词提取分析报告
+        # 生成Markdown报告（片段收集到列表，最后一次性拼接）
+        parts = []
+        append = parts.append
+        append(f"""# 模型关键词提取分析报告
 
 ## 概览统计
 
@@ -357,90 +493,64 @@ class ModelKeywordExtractor:
 
 | 维度 | 关键词数量 | 占比 |
 |------|------------|------|
-"""
+""")
         
-        for dimension, count in sorted(dimension_stats.items(), key=lambda x: x[1], reverse=True):
+        for dimension, count in dimension_stats.most_common():
             percentage = count / total_keywords * 100
-            report_content += f"| {dimension} | {count} | {percentage:.1f}% |\n"
+            append(f"| {dimension} | {count} | {percentage:.1f}% |\n")
         
-        report_content += f"""
+        append("""
 ## 原始数据高频关键词分析
 
 > 基于去重前的原始提取数据，展示整个数据集中最常见的关键词
 
 | 排名 | 关键词 | 原始出现次数 | 最终保留次数 |
 |------|--------|-------------|-------------|
-"""
+""")
         
-        # 统计最终结果中的关键词频率
-        final_keyword_freq = {}
-        for kw in final_keywords:
-            final_keyword_freq[kw] = final_keyword_freq.get(kw, 0) + 1
-        
-        top_original_keywords = sorted(original_keyword_freq.items(), key=lambda x: x[1], reverse=True)[:20]
+        top_original_keywords = original_keyword_freq.most_common(20)
         for i, (keyword, original_freq) in enumerate(top_original_keywords, 1):
-            final_freq = final_keyword_freq.get(keyword, 0)
-            report_content += f"| {i} | {keyword} | {original_freq} | {final_freq} |\n"
+            final_freq = final_keyword_freq[keyword]
+            append(f"| {i} | {keyword} | {original_freq} | {final_freq} |\n")
         
         # 添加所有关键词列表部分
-        report_content += """
+        append("""
 ## 所有关键词列表
 
-"""
+""")
         
-        # 按维度分组显示所有关键词（最终结果）
-        keywords_by_dimension = {}
-        for result in final_results:
-            for kw in result.keywords:
-                dimension = kw['dimension']
-                if dimension not in keywords_by_dimension:
-                    keywords_by_dimension[dimension] = []
-                keywords_by_dimension[dimension].append(kw['keyword'])
-        
-        # 为每个维度添加关键词列表
+        # 按维度分组显示所有关键词（最终结果），每个维度的关键词已去重，这里只需排序
         for dimension in sorted(keywords_by_dimension.keys()):
-            keywords = sorted(set(keywords_by_dimension[dimension]))  # 去重并排序
-            report_content += f"\n### {dimension} ({len(keywords)}个)\n\n"
+            keywords = sorted(keywords_by_dimension[dimension])
+            append(f"\n### {dimension} ({len(keywords)}个)\n\n")
             
             # 将关键词分成多行显示，每行最多5个
             for i in range(0, len(keywords), 5):
                 line_keywords = keywords[i:i+5]
-                report_content += "- " + " • ".join(f"**{kw}**" for kw in line_keywords) + "\n"
+                append("- " + " • ".join(f"**{kw}**" for kw in line_keywords) + "\n")
         
-        report_content += """
+        append("""
 ## 详细结果
 
-"""
+""")
         
         # 添加每个模型的详细结果（使用CSV去重后的结果）
         for result in csv_dedup_results:
-            model_name = result.model_url.split('/')[-2:] if '/' in result.model_url else [result.model_url]
-            model_name = '/'.join(model_name)
-            
-            # 将URL中的gitcode.com替换为ai.gitcode.com
-            ai_url = result.model_url.replace('gitcode.com', 'ai.gitcode.com')
-            
-            report_content += f"\n### {model_name}\n\n"
-            report_content += f"**URL**: {ai_url}\n\n"
-            report_content += "**关键词列表**:\n\n"
-            
-            for kw in result.keywords:
-                report_content += f"- **{kw['keyword']}** ({kw['dimension']}): {kw['reason']}\n"
+            append(f"\n### {_report_model_name(result.model_url)}\n\n"
+                   f"**URL**: {_ai_url(result.model_url)}\n\n**关键词列表**:\n\n")
+            parts.extend(f"- **{kw['keyword']}** ({kw['dimension']}): {kw['reason']}\n" for kw in result.keywords)
         
         # 保存报告
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        self._submit_io(_write_text, output_file, "".join(parts))
         
         print(f"✅ 报告生成完成: {output_file}")
         
         # 生成CSV文件
-        csv_file = output_file.replace('.md', '.csv')
         self.generate_csv_output(final_results, csv_file)
         print(f"✅ CSV文件生成完成: {csv_file}")
         
         # 生成纯文本关键词列表
-        txt_file = output_file.replace('.md', '_keywords.txt')
-        self.generate_keywords_txt(final_results, txt_file)
+        self.generate_keywords_txt(final_results, txt_file, keywords_by_dimension)
         print(f"✅ 关键词列表文件生成完成: {txt_file}")
     
     def generate_csv_output(self, keyword_results: List[KeywordResult], csv_file: str):
@@ -451,108 +561,73 @@ class ModelKeywordExtractor:
             keyword_results: 关键词结果列表
             csv_file: CSV文件路径
         """
-        import csv
-        
         print(f"\n📊 生成CSV输出文件...")
         
-        # 用于去重的已使用关键词集合（保留先生成的，不区分大小写）
-        used_keywords_lower = set()  # 存储小写版本用于比较
         csv_data = []
+        extend = csv_data.extend
         
-        for result in keyword_results:
-            # 提取项目名称（从URL中获取）
-            project_name = result.model_url.split('/')[-1] if '/' in result.model_url else result.model_url
-            if result.model_url.count('/') >= 2:
-                # 如果URL包含用户名/项目名格式，提取最后两部分
-                parts = result.model_url.rstrip('/').split('/')
-                if len(parts) >= 2:
-                    project_name = '/'.join(parts[-2:])
-            
-            # 处理每个关键词（按生成顺序，去重保留先生成的）
-            for kw in result.keywords:
-                keyword = kw['keyword']
-                keyword_lower = keyword.lower()  # 转换为小写用于比较
-                
-                # 去重：不区分大小写，保留先生成的关键词
-                if keyword_lower not in used_keywords_lower:
-                    used_keywords_lower.add(keyword_lower)
-                    # 将URL中的gitcode.com替换为ai.gitcode.com
-                    ai_url = result.model_url.replace('gitcode.com', 'ai.gitcode.com')
-                    csv_data.append({
-                        '项目链接': ai_url,
-                        '项目名称': project_name,
-                        '高亮词': keyword
-                    })
-        
-        # 写入CSV文件
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            if csv_data:
-                fieldnames = ['项目链接', '项目名称', '高亮词']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                # 写入表头
-                writer.writeheader()
-                
-                # 写入数据
-                for row in csv_data:
-                    writer.writerow(row)
+        # 去重：不区分大小写，按生成顺序保留先生成的关键词
+        for result in _iter_dedup_results(keyword_results, str.lower):
+            ai_url = _ai_url(result.model_url)
+            project_name = _csv_project_name(result.model_url)
+            extend((ai_url, project_name, kw['keyword']) for kw in result.keywords)
+        
+        # 写入CSV文件（后台线程写盘，整块写入缓冲区）
+        self._submit_io(_write_csv, csv_file, ('项目链接', '项目名称', '高亮词'), csv_data)
         
         print(f"📊 CSV统计:")
         print(f"   📝 总项目数: {len(keyword_results)}")
-        print(f"   🔍 去重前关键词数: {sum(len(r.keywords) for r in keyword_results)}")
+        total_before = sum(len(r.keywords) for r in keyword_results)
+        print(f"   🔍 去重前关键词数: {total_before}")
         print(f"   ✂️ 去重后关键词数: {len(csv_data)}")
-        print(f"   📉 去重率: {(1 - len(csv_data) / sum(len(r.keywords) for r in keyword_results)) * 100:.1f}%")
+        print(f"   📉 去重率: {(1 - len(csv_data) / total_before) * 100:.1f}%")
     
-    def generate_keywords_txt(self, keyword_results: List[KeywordResult], txt_file: str):
+    def generate_keywords_txt(self, keyword_results: List[KeywordResult], txt_file: str,
+                              keywords_by_dimension: Optional[Dict[str, Set[str]]] = None):
         """
         生成纯文本格式的关键词列表文件（无markdown格式）
         
         Args:
             keyword_results: 关键词结果列表
             txt_file: 文本文件路径
+            keywords_by_dimension: 已按维度分组的关键词（由keyword_results计算得到），None时在此计算
         """
         print(f"\n📄 生成纯文本关键词列表...")
         
         # 按维度分组显示所有关键词
-        keywords_by_dimension = {}
-        for result in keyword_results:
-            for kw in result.keywords:
-                dimension = kw['dimension']
-                if dimension not in keywords_by_dimension:
-                    keywords_by_dimension[dimension] = []
-                keywords_by_dimension[dimension].append(kw['keyword'])
+        if keywords_by_dimension is None:
+            keywords_by_dimension = _group_keywords_by_dimension(keyword_results)
         
-        # 生成纯文本内容
-        txt_content = "所有关键词列表\n"
-        txt_content += "=" * 50 + "\n\n"
+        # 生成纯文本内容（片段收集到列表，最后一次性拼接）
+        parts = ["所有关键词列表\n", "=" * 50 + "\n\n"]
+        append = parts.append
         
         # 为每个维度添加关键词列表
         for dimension in sorted(keywords_by_dimension.keys()):
-            keywords = sorted(set(keywords_by_dimension[dimension]))  # 去重并排序
-            txt_content += f"{dimension} ({len(keywords)}个)\n"
-            txt_content += "-" * 30 + "\n"
+            keywords = sorted(keywords_by_dimension[dimension])
+            append(f"{dimension} ({len(keywords)}个)\n")
+            append("-" * 30 + "\n")
             
             # 将关键词分成多行显示，每行最多8个
             for i in range(0, len(keywords), 8):
                 line_keywords = keywords[i:i+8]
-                txt_content += " • ".join(line_keywords) + "\n"
+                append(" • ".join(line_keywords) + "\n")
             
-            txt_content += "\n"
+            append("\n")
         
         # 添加统计信息
-        total_unique_keywords = len(set(kw for keywords in keywords_by_dimension.values() for kw in keywords))
+        total_unique_keywords = len(set().union(*keywords_by_dimension.values()))
         total_keywords = sum(len(r.keywords) for r in keyword_results)
         
-        txt_content += "统计信息\n"
-        txt_content += "=" * 50 + "\n"
-        txt_content += f"总模型数: {len(keyword_results)}\n"
-        txt_content += f"关键词总数: {total_keywords}\n"
-        txt_content += f"去重后关键词数: {total_unique_keywords}\n"
-        txt_content += f"平均每模型关键词数: {total_keywords/len(keyword_results):.1f}\n"
+        append("统计信息\n")
+        append("=" * 50 + "\n")
+        append(f"总模型数: {len(keyword_results)}\n")
+        append(f"关键词总数: {total_keywords}\n")
+        append(f"去重后关键词数: {total_unique_keywords}\n")
+        append(f"平均每模型关键词数: {total_keywords/len(keyword_results):.1f}\n")
         
         # 保存文件
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write(txt_content)
+        self._submit_io(_write_text, txt_file, "".join(parts))
         
         print(f"📄 纯文本统计:")
         print(f"   📝 维度数: {len(keywords_by_dimension)}")
@@ -573,12 +648,15 @@ class ModelKeywordExtractor:
 
 def main():
     """主函数"""
+    setup_logging()
+    
     parser = argparse.ArgumentParser(description="AI模型关键词提取系统")
     parser.add_argument("--max-models", type=int, default=10, help="最大模型数量 (默认: 10)")
     parser.add_argument("--force-crawl", action="store_true", help="强制重新获取模型信息")
     parser.add_argument("--test-url", type=str, help="测试单个模型URL")
     parser.add_argument("--output-dir", type=str, default="output", help="输出目录 (默认: output)")
     parser.add_argument("--token", type=str, help="可选的认证token")
+    parser.add_argument("--no-keyword-cache", action="store_true", help="不使用关键词缓存，全部重新提取")
     
     args = parser.parse_args()
     
@@ -596,7 +674,8 @@ def main():
     extractor = ModelKeywordExtractor(
         output_dir=args.output_dir, 
         token=args.token,
-        use_multi_platform=use_multi_platform
+        use_multi_platform=use_multi_platform,
+        llm_cache_enabled=not args.no_keyword_cache
     )
     
     if args.test_url:
@@ -0,0 +1,42 @@
+"""
+日志配置 - 日志记录先入队，由后台线程统一格式化并输出
+"""
+import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None):
+    """
+    配置根日志器（重复调用不会重复添加处理器）
+
+    调用方只负责把日志记录放入队列，格式化和写stdout在QueueListener的
+    后台线程中完成，并发协程不再争抢标准输出锁
+
+    Args:
+        level: 日志级别名称（None时读取环境变量LOG_LEVEL，默认INFO）
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    # 退出时停止监听线程，确保队列中剩余的日志全部输出
+    atexit.register(_listener.stop)
@@ -2,13 +2,26 @@
 数据模型定义
 """
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 import json
+import mmap
+import os
 
+try:
+    import orjson
+except ImportError:  # orjson为可选加速依赖，缺失时回退到标准库
+    orjson = None
 
-@dataclass
+# 写输出文件时使用的缓冲区大小（数据先在内存中累积，按大块写入磁盘）
+WRITE_BUFFER_SIZE = 1 << 20
+
+# 超过该大小的JSON文件通过mmap交给orjson解析，不再先复制成一份完整的bytes
+MMAP_LOAD_THRESHOLD = 16 << 20
+
+
+@dataclass(slots=True)
 class ModelInfo:
-    """AI模型信息数据类"""
+    """AI模型信息数据类（每行CSV一个实例，使用__slots__省去实例字典）"""
     url: str = ""
     project_name: str = ""
     readme: str = ""
@@ -25,7 +38,11 @@ class ModelInfo:
     
     @classmethod
     def from_dict(cls, data: dict):
-        """从字典创建实例"""
+        """从字典创建实例（字段齐全时按位置直接构造，缺字段时才逐个取默认值）"""
+        try:
+            return cls(data["url"], data["project_name"], data["readme"], data["tags"])
+        except KeyError:
+            pass
         return cls(
             url=data.get("url", ""),
             project_name=data.get("project_name", ""),
@@ -34,9 +51,9 @@ class ModelInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class KeywordResult:
-    """关键词提取结果数据类"""
+    """关键词提取结果数据类（每个模型一个实例，使用__slots__省去实例字典）"""
     model_url: str
     keywords: List[dict] = field(default_factory=list)  # [{"keyword": "", "dimension": "", "reason": ""}]
     
@@ -49,23 +66,82 @@ class KeywordResult:
     
     @classmethod
     def from_dict(cls, data: dict):
-        """从字典创建实例"""
+        """从字典创建实例（字段齐全时按位置直接构造，缺字段时才逐个取默认值）"""
+        try:
+            return cls(data["model_url"], data["keywords"])
+        except KeyError:
+            pass
         return cls(
             model_url=data.get("model_url", ""),
             keywords=data.get("keywords", [])
         )
 
 
+def json_loads(data):
+    """解析JSON字符串或字节（优先使用orjson，解析失败同样抛出json.JSONDecodeError）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data) -> str:
+    """序列化为紧凑的JSON字符串（优先使用orjson，非ASCII字符原样保留）"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
 def save_to_json(data, filename: str):
-    """保存数据到JSON文件"""
-    with open(filename, 'w', encoding='utf-8') as f:
+    """保存数据到JSON文件（优先使用orjson直接序列化为字节，内容格式与标准库indent=2一致）"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        with open(filename, 'wb') as f:
+            f.write(payload)
+        return
+    with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+def save_to_ndjson(records: Iterable, filename: str):
+    """
+    逐条保存记录到NDJSON文件（每行一条JSON，不在内存中拼出整个文件）
+
+    Args:
+        records: 可迭代的记录（字典等可序列化对象）
+        filename: 输出文件路径
+    """
+    if orjson is not None:
+        def dumps(record):
+            return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        def dumps(record):
+            return json_dumps(record).encode('utf-8')
+
+    with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        write = f.write
+        for record in records:
+            write(dumps(record))
+            write(b"\n")
+
+
+def iter_ndjson(filename: str) -> Iterator:
+    """逐行读取NDJSON文件中的记录（跳过空行）"""
+    with open(filename, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json_loads(line)
+
+
 def load_from_json(filename: str):
-    """从JSON文件加载数据"""
+    """从JSON文件加载数据（.ndjson文件按行解析，返回记录列表；大文件经mmap零拷贝解析）"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if filename.endswith('.ndjson'):
+            return list(iter_ndjson(filename))
+        with open(filename, 'rb') as f:
+            if orjson is not None and os.fstat(f.fileno()).st_size >= MMAP_LOAD_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json_loads(f.read())
     except FileNotFoundError:
         return []
@@ -4,7 +4,10 @@
 import os
 import re
 import json
+import time
+import random
 import asyncio
+import logging
 import aiohttp
 from typing import List, Dict, Any, Optional, Tuple
 from openai import AsyncOpenAI
@@ -12,18 +15,39 @@ from dotenv import load_dotenv
 
 from models import ModelInfo, KeywordResult
 from base_extractor import BaseKeywordExtractor
+from log_utils import setup_logging
+
+logger = logging.getLogger(__name__)
 
 # 加载环境变量
 load_dotenv()
 
 
+class _RateLimited(Exception):
+    """平台返回API限制错误（429/503），调用方应退避后重试"""
+
+
 class MultiPlatformExtractor(BaseKeywordExtractor):
     """多平台关键词提取器"""
     
-    def __init__(self):
-        """初始化多个AI客户端"""
-        super().__init__()  # 调用基类初始化
+    # 限流错误在同一平台上的最大重试次数与指数退避基础延迟（秒）
+    RATE_LIMIT_RETRIES = 3
+    RETRY_BASE_DELAY = 1
+    
+    def __init__(self, concurrency_per_platform: int = 2, llm_cache_enabled: bool = True):
+        """
+        初始化多个AI客户端
+        
+        Args:
+            concurrency_per_platform: 批量提取时每个平台同时在途的最大请求数
+            llm_cache_enabled: 是否启用LLM响应缓存
+        """
+        super().__init__(llm_cache_enabled=llm_cache_enabled)  # 调用基类初始化（含缓存配置）
         self.platforms = self._init_platforms()
+        self.concurrency_per_platform = max(1, concurrency_per_platform)
+        # 各平台当前在途请求数及峰值
+        self.in_flight: Dict[str, int] = {pid: 0 for pid in self.platforms}
+        self.peak_in_flight: Dict[str, int] = {pid: 0 for pid in self.platforms}
         
     def _init_platforms(self) -> Dict[str, Dict]:
         """初始化支持的平台配置"""
@@ -149,22 +173,43 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
                 "enabled": True
             }
         
-        print(f"🚀 初始化完成，支持 {len(platforms)} 个平台:")
+        logger.info("🚀 初始化完成，支持 %s 个平台:", len(platforms))
         for platform_id, config in platforms.items():
-            print(f"   - {config['name']} ({platform_id}): {config['model']}")
+            logger.info("   - %s (%s): %s", config['name'], platform_id, config['model'])
         
         return platforms
     
     # build_prompt 方法已移至 BaseKeywordExtractor
     
+    @staticmethod
+    def _is_rate_limit_error(error_msg: str) -> bool:
+        """判断是否为API限制错误（429/503）"""
+        lowered = error_msg.lower()
+        return "429" in error_msg or "503" in error_msg or "rate_limit" in lowered or "too busy" in lowered
+    
     async def extract_keywords_single_platform(self, model_info: ModelInfo, platform_id: str) -> Optional[Tuple[str, List[Dict[str, str]]]]:
-        """使用单个平台提取关键词"""
-        import time
-        start_time = time.time()
-        
+        """使用单个平台提取关键词，遇到API限制时按指数退避重试（最多RATE_LIMIT_RETRIES次）"""
         if platform_id not in self.platforms or not self.platforms[platform_id]["enabled"]:
             return None
         
+        attempt = 0
+        while True:
+            try:
+                return await self._extract_single_platform_attempt(model_info, platform_id)
+            except _RateLimited:
+                if attempt >= self.RATE_LIMIT_RETRIES:
+                    return None
+                # 指数退避 + 随机抖动，避免同一平台的多个worker同时重试
+                delay = self.RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, 1)
+                logger.warning("⏳ %s 遇到API限制，等待 %.1f 秒后重试 (%s/%s)...",
+                               self.platforms[platform_id]["name"], delay, attempt + 1, self.RATE_LIMIT_RETRIES)
+                await asyncio.sleep(delay)
+                attempt += 1
+    
+    async def _extract_single_platform_attempt(self, model_info: ModelInfo, platform_id: str) -> Optional[Tuple[str, List[Dict[str, str]]]]:
+        """单次调用单个平台提取关键词，遇到API限制时抛出_RateLimited"""
+        start_time = time.time()
+        
         platform = self.platforms[platform_id]
         client = platform["client"]
         model = platform["model"]
@@ -174,8 +219,16 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
         model_name = model_info.url.split('/')[-2:] if '/' in model_info.url else [model_info.url]
         model_name = '/'.join(model_name)
         
+        # 命中缓存时直接返回，跳过网络请求
+        cache_key = self._cache_key(model_info, platform_id, model) if self.llm_cache_enabled else None
+        if cache_key:
+            cached_keywords = self._load_cached_keywords(cache_key)
+            if cached_keywords:
+                logger.debug("💾 命中缓存：%s (%s 个关键词)", model_name, len(cached_keywords))
+                return platform_id, cached_keywords
+        
         try:
-            print(f"🔄 使用 {platform_name} 处理 {model_name}...")
+            logger.debug("🔄 使用 %s 处理 %s...", platform_name, model_name)
             
             prompt = self.build_prompt(model_info)
             
@@ -203,30 +256,31 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
                     "enable_thinking": False  # 关闭思考功能，加快响应速度
                 }
             
-            completion = await client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "你是一位专业的AI项目运营专家和SEO大师，专门负责从AI模型项目中提取高价值的关键词。"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1200,  # 进一步增加token数量，避免响应被截断
-                **extra_params
-            )
+            self.in_flight[platform_id] += 1
+            if self.in_flight[platform_id] > self.peak_in_flight[platform_id]:
+                self.peak_in_flight[platform_id] = self.in_flight[platform_id]
+            try:
+                completion = await client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": self.SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=1200,  # 进一步增加token数量，避免响应被截断
+                    **extra_params
+                )
+            finally:
+                self.in_flight[platform_id] -= 1
             
             response_content = completion.choices[0].message.content
             
-            # 为智谱AI添加详细调试信息
-            if platform_id == "zhipu":
-                print(f"🔍 智谱AI调试信息:")
-                print(f"   响应长度: {len(response_content)} 字符")
-                print(f"   响应内容前500字符:")
-                print(f"   {response_content[:500]}")
-                print(f"   响应内容后500字符:")
-                print(f"   {response_content[-500:]}")
-                print(f"   完整响应内容:")
-                print(f"   {response_content}")
-                print(f"   响应内容类型: {type(response_content)}")
+            # 为智谱AI添加详细调试信息（只在DEBUG级别输出，其余情况不拼接响应内容）
+            if platform_id == "zhipu" and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🔍 智谱AI调试信息:\n   响应长度: %s 字符\n   响应内容类型: %s\n   完整响应内容:\n   %s",
+                    len(response_content), type(response_content), response_content
+                )
             
             keywords = self._parse_keywords_response(response_content)
             
@@ -234,37 +288,31 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
             processing_time = end_time - start_time
             
             if keywords:
-                print(f"✅ {platform_name} 成功处理 {model_name} ({processing_time:.2f}s) - 提取 {len(keywords)} 个关键词")
+                if cache_key:
+                    self._save_cached_keywords(cache_key, keywords)
+                logger.debug("✅ %s 成功处理 %s (%.2fs) - 提取 %s 个关键词", platform_name, model_name, processing_time, len(keywords))
                 return platform_id, keywords
             else:
-                print(f"❌ {platform_name} 处理 {model_name} ({processing_time:.2f}s) - 未能提取到有效关键词")
+                logger.error("❌ %s 处理 %s (%.2fs) - 未能提取到有效关键词", platform_name, model_name, processing_time)
                 return None
                 
         except Exception as e:
             end_time = time.time()
             processing_time = end_time - start_time
             error_msg = str(e)
-            print(f"❌ {platform_name} 处理 {model_name} ({processing_time:.2f}s) - 提取失败: {e}")
+            logger.error("❌ %s 处理 %s (%.2fs) - 提取失败: %s", platform_name, model_name, processing_time, e)
             
-            # 检查是否是API限制错误（429/503）
-            if "429" in error_msg or "503" in error_msg or "rate_limit" in error_msg.lower() or "too busy" in error_msg.lower():
-                # 计算延迟时间：基础延迟 + 随机延迟
-                import random
-                base_delay = 1  # 减少基础延迟到1秒
-                random_delay = random.uniform(0.5, 1.5)  # 减少随机延迟
-                total_delay = base_delay + random_delay
-                
-                print(f"⏳ {platform_name} 遇到API限制，等待 {total_delay:.1f} 秒后重试...")
-                await asyncio.sleep(total_delay)
+            # API限制错误交给调用方退避重试
+            if self._is_rate_limit_error(error_msg):
+                raise _RateLimited() from e
             
             return None
     
     async def extract_keywords_concurrent(self, model_info: ModelInfo) -> Optional[KeywordResult]:
         """并发调用多个平台提取关键词"""
-        import time
         start_time = time.time()
         
-        print(f"🚀 并发调用 {len(self.platforms)} 个平台提取关键词...")
+        logger.debug("🚀 并发调用 %s 个平台提取关键词...", len(self.platforms))
         
         # 创建并发任务
         tasks = []
@@ -274,7 +322,7 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
                 tasks.append(task)
         
         if not tasks:
-            print("❌ 没有可用的平台")
+            logger.error("❌ 没有可用的平台")
             return None
         
         # 并发执行所有任务
@@ -284,13 +332,13 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
         successful_results = []
         for result in results:
             if isinstance(result, Exception):
-                print(f"❌ 平台调用异常: {result}")
+                logger.error("❌ 平台调用异常: %s", result)
             elif result is not None:
                 platform_id, keywords = result
                 successful_results.append((platform_id, keywords))
         
         if not successful_results:
-            print("❌ 所有平台都提取失败")
+            logger.error("❌ 所有平台都提取失败")
             return None
         
         # 选择最佳结果（优先选择关键词数量最多的）
@@ -298,7 +346,7 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
         best_platform_name = self.platforms[best_platform_id]["name"]
         
         elapsed_time = time.time() - start_time
-        print(f"✅ 最佳结果来自 {best_platform_name}: {len(best_keywords)} 个关键词 (总耗时: {elapsed_time:.1f}秒)")
+        logger.debug("✅ 最佳结果来自 %s: %s 个关键词 (总耗时: %.1f秒)", best_platform_name, len(best_keywords), elapsed_time)
         
         return KeywordResult(
             model_url=model_info.url,
@@ -309,17 +357,33 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
     
     # _validate_keyword, _clean_keyword, _fix_common_json_errors, _fix_truncated_json 方法已移至 BaseKeywordExtractor
     
+    async def aclose(self):
+        """关闭所有平台客户端的HTTP连接池，并换上新的客户端，之后的调用仍可正常使用"""
+        await asyncio.gather(*(config["client"].close() for config in self.platforms.values()))
+        for config in self.platforms.values():
+            old_client = config["client"]
+            config["client"] = AsyncOpenAI(api_key=old_client.api_key, base_url=old_client.base_url)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
     def extract_keywords(self, model_info: ModelInfo) -> Optional[KeywordResult]:
         """实现抽象方法 - 同步版本的关键词提取"""
         return asyncio.run(self.extract_keywords_concurrent(model_info))
     
-    async def extract_batch_keywords(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
-        """批量提取关键词（work-stealing版本）"""
+    def extract_batch_keywords(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
+        """实现抽象方法 - 同步版本的批量提取"""
+        return asyncio.run(self.extract_batch_keywords_async(model_infos))
+    
+    async def extract_batch_keywords_async(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
+        """批量提取关键词（work-stealing版本，各平台多个worker并发）"""
         return await self._work_stealing_main(model_infos)
     
     async def _work_stealing_main(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
         """任务池 + work-stealing 主逻辑"""
-        import time
         start_time = time.time()
         
         total = len(model_infos)
@@ -329,11 +393,12 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
         platform_count = len(available_platforms)
         
         if platform_count == 0:
-            print("❌ 没有可用的平台")
+            logger.error("❌ 没有可用的平台")
             return []
         
-        print(f"🚀 任务池启动，模型 {total} 个，平台 {platform_count} 个")
-        print(f"🔥 并发模式：{platform_count} 个平台同时工作，快速处理任务")
+        logger.info("🚀 任务池启动，模型 %s 个，平台 %s 个", total, platform_count)
+        logger.info("🔥 并发模式：%s 个平台同时工作，每个平台最多 %s 个请求在途",
+                    platform_count, self.concurrency_per_platform)
         
         # 创建任务队列 (ModelInfo, retry_count)
         queue = asyncio.Queue()
@@ -348,13 +413,14 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
         progress_lock = asyncio.Lock()
         completed_count = [0]  # 使用列表以便在不同协程间共享
         
-        # 创建worker任务
+        # 创建worker任务：按平台轮流创建，每个平台concurrency_per_platform个
         workers = []
-        for platform_id in available_platforms:
-            worker = asyncio.create_task(
-                self._worker(platform_id, queue, results, lock, platform_count, progress_lock, completed_count, total)
-            )
-            workers.append(worker)
+        for _ in range(self.concurrency_per_platform):
+            for platform_id in available_platforms:
+                worker = asyncio.create_task(
+                    self._worker(platform_id, queue, results, lock, platform_count, progress_lock, completed_count, total)
+                )
+                workers.append(worker)
         
         # 启动进度监控任务
         progress_task = asyncio.create_task(
@@ -377,13 +443,14 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
         total_time = end_time - start_time
         avg_time = total_time / len(results) if results else 0
         
-        print(f"\n🚀 任务池处理完成，成功处理 {len(results)} 个模型")
-        print(f"⏱️  总耗时: {total_time:.2f}秒，平均耗时: {avg_time:.2f}秒/模型")
+        logger.info("\n🚀 任务池处理完成，成功处理 %s 个模型", len(results))
+        logger.info("⏱️  总耗时: %.2f秒，平均耗时: %.2f秒/模型", total_time, avg_time)
+        for platform_id in available_platforms:
+            logger.info("   - %s 峰值在途请求数: %s", self.platforms[platform_id]["name"], self.peak_in_flight[platform_id])
         return results
     
     async def _progress_monitor(self, progress_lock: asyncio.Lock, completed_count: int, total: int, start_time: float):
         """进度监控任务"""
-        import time
         
         while True:
             try:
@@ -435,11 +502,11 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
                 # 如果连续失败次数过多，增加延迟
                 if consecutive_failures > 2:
                     delay = min(consecutive_failures * 0.5, 3.0)  # 最多延迟3秒
-                    print(f"⏳ {platform_name} 连续失败 {consecutive_failures} 次，延迟 {delay:.1f} 秒...")
+                    logger.warning("⏳ %s 连续失败 %s 次，延迟 %.1f 秒...", platform_name, consecutive_failures, delay)
                     await asyncio.sleep(delay)
                 
                 # 显示开始处理
-                print(f"🔄 使用 {platform_name} 处理 {model_info.project_name}...")
+                logger.debug("🔄 使用 %s 处理 %s...", platform_name, model_info.project_name)
                 
                 # 尝试处理模型
                 result = await self.extract_keywords_single_platform(model_info, platform_id)
@@ -476,7 +543,7 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
                         queue.task_done()
                     else:
                         # 所有平台都试过了，丢弃
-                        print(f"\n⚠️  {model_info.project_name} 所有平台均失败，已丢弃")
+                        logger.warning("\n⚠️  %s 所有平台均失败，已丢弃", model_info.project_name)
                         
                         # 更新进度计数（即使失败也算完成）
                         async with progress_lock:
@@ -490,25 +557,25 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
             except Exception as e:
                 # 单个任务异常，增加连续失败计数
                 consecutive_failures += 1
-                print(f"❌ {platform_name} 处理异常: {e}")
+                logger.error("❌ %s 处理异常: %s", platform_name, e)
                 try:
                     queue.task_done()
                 except ValueError:
                     pass  # 如果task_done()被调用多次，忽略错误
         
-        print(f"✅ {platform_name} 成功处理 {success_count} 个")
+        logger.info("✅ %s 成功处理 %s 个", platform_name, success_count)
     
     async def extract_keywords_shard(self, platform_id: str, model_infos: List[ModelInfo], start_index: int) -> List[KeywordResult]:
         """单个平台处理分片"""
         platform_name = self.platforms[platform_id]["name"]
         shard_size = len(model_infos)
         
-        print(f"🔄 {platform_name} 开始处理分片 (模型 {start_index+1}-{start_index+shard_size})")
+        logger.info("🔄 %s 开始处理分片 (模型 %s-%s)", platform_name, start_index+1, start_index+shard_size)
         
         results = []
         for i, model_info in enumerate(model_infos):
             model_index = start_index + i + 1
-            print(f"   进度: {model_index}/{start_index+shard_size} - {model_info.project_name}")
+            logger.debug("   进度: %s/%s - %s", model_index, start_index+shard_size, model_info.project_name)
             
             # 使用单个平台提取关键词
             result = await self.extract_keywords_single_platform(model_info, platform_id)
@@ -520,11 +587,11 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
                     keywords=keywords
                 )
                 results.append(keyword_result)
-                print(f"   ✅ 成功提取 {len(keywords)} 个关键词")
+                logger.debug("   ✅ 成功提取 %s 个关键词", len(keywords))
             else:
-                print(f"   ❌ 提取失败")
+                logger.error("   ❌ 提取失败")
         
-        print(f"✅ {platform_name} 分片处理完成，成功 {len(results)}/{shard_size} 个模型")
+        logger.info("✅ %s 分片处理完成，成功 %s/%s 个模型", platform_name, len(results), shard_size)
         return results
 
 
@@ -532,8 +599,8 @@ class MultiPlatformExtractor(BaseKeywordExtractor):
 class MultiPlatformExtractorSync:
     """多平台关键词提取器（同步版本）"""
     
-    def __init__(self):
-        self.async_extractor = MultiPlatformExtractor()
+    def __init__(self, llm_cache_enabled: bool = True):
+        self.async_extractor = MultiPlatformExtractor(llm_cache_enabled=llm_cache_enabled)
     
     def extract_keywords(self, model_info: ModelInfo) -> Optional[KeywordResult]:
         """同步版本的关键词提取"""
@@ -541,7 +608,15 @@ class MultiPlatformExtractorSync:
     
     def extract_batch_keywords(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
         """同步版本的批量提取"""
-        return asyncio.run(self.async_extractor.extract_batch_keywords(model_infos))
+        return self.async_extractor.extract_batch_keywords(model_infos)
+    
+    async def extract_batch_keywords_async(self, model_infos: List[ModelInfo]) -> List[KeywordResult]:
+        """异步版本的批量提取"""
+        return await self.async_extractor.extract_batch_keywords_async(model_infos)
+    
+    async def aclose(self):
+        """关闭底层HTTP连接池"""
+        await self.async_extractor.aclose()
     
     def deduplicate_keywords(self, keyword_results: List[KeywordResult]) -> List[KeywordResult]:
         """同步版本的关键词去重"""
@@ -550,9 +625,6 @@ class MultiPlatformExtractorSync:
 
 def test_multi_platform():
     """测试多平台提取功能"""
-    import asyncio
-    from models import ModelInfo
-    
     async def test_async():
         extractor = MultiPlatformExtractor()
         
@@ -579,4 +651,5 @@ def test_multi_platform():
 
 
 if __name__ == "__main__":
+    setup_logging()
     test_multi_platform()
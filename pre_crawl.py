@@ -7,20 +7,20 @@
 - 从模型提示词.csv读取所有符合条件的模型
 - 使用爬虫获取README和标签信息
 - 支持断点续传和分批处理
-- 实时保存到缓存文件
+- 按批次保存到缓存文件
 """
 
 import os
-import json
 import time
 import argparse
 from datetime import datetime
 from typing import List, Dict, Set
 from tqdm import tqdm
 
-from models import ModelInfo
+from models import ModelInfo, save_to_json, load_from_json
 from csv_reader import CSVModelReader, DEFAULT_CSV_FILE
 from hf_scraper import scrape_hf_model_sync
+from log_utils import setup_logging
 
 
 class PreCrawler:
@@ -60,8 +60,7 @@ class PreCrawler:
             return {}
         
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
+            cached_data = load_from_json(self.cache_file)
             
             cached_models = {}
             for data in cached_data:
@@ -131,7 +130,7 @@ class PreCrawler:
     def crawl_models_batch(self, models: List[ModelInfo], batch_size: int = 50, 
                           cached_models: Dict[str, ModelInfo] = None) -> List[ModelInfo]:
         """
-        分批爬取模型数据，每爬取一个立即保存到缓存
+        分批爬取模型数据，每完成一个批次保存一次缓存
         
         Args:
             models: 要爬取的模型列表
@@ -146,7 +145,7 @@ class PreCrawler:
             return []
         
         print(f"🚀 开始分批爬取 {len(models)} 个模型 (批次大小: {batch_size})")
-        print("💾 实时保存模式：每爬取一个模型立即保存到缓存")
+        print("💾 批量保存模式：每完成一个批次保存一次缓存")
         
         successful_models = []
         total_batches = (len(models) + batch_size - 1) // batch_size
@@ -167,12 +166,11 @@ class PreCrawler:
                     if detailed_model.readme or detailed_model.tags:
                         batch_successful.append(detailed_model)
                         
-                        # 立即保存到缓存
+                        # 先更新内存中的缓存，批次结束时统一写入文件
                         if cached_models is not None:
                             cached_models[detailed_model.url] = detailed_model
-                            self.save_cache_immediate(cached_models)
                         
-                        print(f"✅ {model.project_name}: README={len(detailed_model.readme)}, 标签={len(detailed_model.tags)} [已保存]")
+                        print(f"✅ {model.project_name}: README={len(detailed_model.readme)}, 标签={len(detailed_model.tags)}")
                     else:
                         print(f"⚠️ {model.project_name}: 爬取失败，跳过")
                     
@@ -187,6 +185,10 @@ class PreCrawler:
             successful_models.extend(batch_successful)
             print(f"📊 批次 {batch_idx + 1} 完成: {len(batch_successful)}/{len(batch_models)} 成功")
             
+            # 每个批次只重写一次缓存文件（中断时最多丢失当前批次）
+            if cached_models is not None and batch_successful:
+                self.save_cache_immediate(cached_models)
+            
             # 批次间稍长延迟
             if batch_idx < total_batches - 1:
                 print("⏸️ 批次间休息 2 秒...")
@@ -197,7 +199,7 @@ class PreCrawler:
     
     def save_cache_immediate(self, cached_models: Dict[str, ModelInfo]):
         """
-        立即保存缓存到文件（实时保存）
+        立即保存缓存到文件（每个批次结束时调用）
         
         Args:
             cached_models: 已缓存的模型字典
@@ -207,8 +209,7 @@ class PreCrawler:
         
         # 保存到文件
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(model_dicts, f, ensure_ascii=False, indent=2)
+            save_to_json(model_dicts, self.cache_file)
             
             # 不打印太多信息，避免刷屏
             # print(f"💾 实时保存: {len(model_dicts)} 个模型")
@@ -233,8 +234,7 @@ class PreCrawler:
         
         # 保存到文件
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(model_dicts, f, ensure_ascii=False, indent=2)
+            save_to_json(model_dicts, self.cache_file)
             
             print(f"💾 缓存已保存: {len(model_dicts)} 个模型 -> {self.cache_file}")
             
@@ -283,12 +283,12 @@ class PreCrawler:
                 print("✅ 所有模型都已缓存，无需爬取")
                 return
             
-            # 5. 分批爬取（实时保存模式）
+            # 5. 分批爬取（按批次保存模式）
             new_models = self.crawl_models_batch(uncached_models, batch_size, cached_models)
             
             # 6. 最终保存缓存（确保数据完整性）
             if new_models:
-                self.save_cache(cached_models, [])  # 传入空列表，因为已经实时保存了
+                self.save_cache(cached_models, [])  # 传入空列表，因为已经按批次保存了
             
             # 7. 统计信息
             end_time = time.time()
@@ -322,6 +322,7 @@ def main():
     parser.add_argument("--token", help="可选的认证token")
     
     args = parser.parse_args()
+    setup_logging()
     
     # 创建预爬取器
     crawler = PreCrawler(
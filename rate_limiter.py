@@ -0,0 +1,64 @@
+"""
+客户端限流器 - 令牌桶算法
+"""
+import time
+import asyncio
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """异步令牌桶限流器（每 period 秒补充 rate 个令牌）"""
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每个周期补充的令牌数（如RPM、TPM）
+            period: 周期长度（秒）
+            capacity: 桶容量（允许的突发量），None时等于rate
+        """
+        self.rate = rate
+        self.period = period
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        """获取绑定当前事件循环的锁（同步入口会多次调用asyncio.run）"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        """按流逝的时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.period)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """
+        获取令牌，不足时等待
+
+        Args:
+            amount: 需要的令牌数（超过容量时按容量计算）
+        """
+        amount = min(amount, self.capacity)
+        async with self._get_lock():
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) * self.period / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False